@@ -0,0 +1,10 @@
+import sys
+import os
+
+src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.insert(0, src_dir)
+
+from cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,20 @@
-import numpy as np
+import math
 import time
-
-def heuristic(a, b):
-    return np.abs(a[0] - b[0]) + np.abs(a[1] - b[1])
-
-def line_of_sight(grid, start, end):
-    """Check if there's a direct line of sight between start and end"""
-    x0, y0 = start
-    x1, y1 = end
+from array import array
+from collections import deque, namedtuple
+
+from distance_field import get_distance_field
+from dstar_lite import DStarLite
+from grid import DIRECTIONS_8, SQRT2, as_grid
+from heuristics import default_heuristic, manhattan, octile
+from hpa import DEFAULT_CLUSTER_SIZE, find_path, get_abstract_graph
+from jump_tables import get_jump_distances
+from priority_queue import OpenList
+from tracing import Tracer, TRACE_OFF, EXPAND, PUSH, RELAX, JUMP
+
+def _line_of_sight(cells, stride, a, b):
+    y0, x0 = divmod(a, stride)
+    y1, x1 = divmod(b, stride)
     dx = abs(x1 - x0)
     dy = abs(y1 - y0)
     sx = 1 if x0 < x1 else -1
@@ -15,7 +22,7 @@ def line_of_sight(grid, start, end):
     err = dx - dy
 
     while (x0, y0) != (x1, y1):
-        if grid[y0][x0] == 1:
+        if cells[y0 * stride + x0]:
             return False
         e2 = 2 * err
         if e2 > -dy:
@@ -25,781 +32,1004 @@ def line_of_sight(grid, start, end):
             err += dx
             y0 += sy
 
-    return grid[y1][x1] == 0
+    return cells[b] == 0
+
+def _line_cost(grid, a, b):
+    """Cost of the straight segment from ``a`` to ``b``.
+
+    That is its Euclidean length times the mean weight of the cells it
+    enters, walked in the same order as ``_line_of_sight``. For a single
+    step this is exactly the step length times the weight of ``b``.
+    """
+    stride = grid.stride
+    y0, x0 = divmod(a, stride)
+    y1, x1 = divmod(b, stride)
+    length = math.hypot(x1 - x0, y1 - y0)
+    if not grid.weighted or a == b:
+        return length
+
+    weights = grid.weights
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    total = count = 0
+    while (x0, y0) != (x1, y1):
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+        total += weights[y0 * stride + x0]
+        count += 1
+    return length * total / count
+
+def _reconstruct_path(grid, came_from, current):
+    path = [grid.coords(current)]
+    while current in came_from:
+        current = came_from[current]
+        path.append(grid.coords(current))
+    path.reverse()
+    return path
+
+def _parent_path(grid, parent, current):
+    path = []
+    while current >= 0:
+        path.append(grid.coords(current))
+        current = parent[current]
+    path.reverse()
+    return path
+
+def _coords_set(grid, indices):
+    coords = grid.coords
+    return {coords(i) for i in indices}
+
+def line_of_sight(grid, start, end):
+    """Check if there's a direct line of sight between start and end"""
+    grid = as_grid(grid)
+    return _line_of_sight(grid.cells, grid.stride, grid.index(start), grid.index(end))
 
 def get_neighbors(node, grid):
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-    neighbors = []
-    x, y = node
-    for dx, dy in directions:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]) and grid[ny][nx] == 0:
-            neighbors.append((nx, ny))
-    return neighbors
+    grid = as_grid(grid)
+    cells = grid.cells
+    i = grid.index(node)
+    return [grid.coords(i + offset) for offset in grid.offsets8 if not cells[i + offset]]
 
 def get_neighbors_no_diagonals(node, grid):
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Only horizontal and vertical movements
-    neighbors = []
-    x, y = node
-    for dx, dy in directions:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]) and grid[ny][nx] == 0:
-            neighbors.append((nx, ny))
-    return neighbors
+    grid = as_grid(grid)
+    cells = grid.cells
+    i = grid.index(node)
+    return [grid.coords(i + offset) for offset in grid.offsets4 if not cells[i + offset]]
 
 
-def astar(start, goal, grid):
+def astar(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    tracer = Tracer('A*', trace, sink)
+    heuristic = heuristic or default_heuristic()
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    cells, weights, steps, stride, coords = grid.cells, grid.weights, grid.steps8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    open_set = set([start])
     closed_set = set()
 
     came_from = {}
 
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    g_score = {source: 0}
+    f_score = {source: heuristic(source, target, stride)}
+
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, f_score[source])
 
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
-
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current], f_score[current])
+
+        current_g = g_score[current]
+        for offset, step in steps:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
                 continue
-            tentative_g_score = g_score[current] + 1
+            tentative_g_score = current_g + step * weights[neighbor]
 
             if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
                 continue
             else:
-                added_to_open_set = "No"
-
-            # User-friendly debug prints to understand the decision-making process
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
+                kind = RELAX
 
             came_from[neighbor] = current
             g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
-
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
-
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+            f_score[neighbor] = tentative_g_score + heuristic(neighbor, target, stride)
+            open_set.push(neighbor, f_score[neighbor])
+            if full:
+                tracer.emit(kind, coords(neighbor), coords(current), g_score[neighbor], f_score[neighbor])
 
+    nodes_explored = _coords_set(grid, closed_set)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
-def branch_and_bound(start, goal, grid):
-    start_time = time.perf_counter()
-    nodes_explored = set()
+def _breadth_first(name, start, goal, grid, diagonal, trace, sink):
+    """Shared FIFO search behind branch_and_bound and bfs.
 
-    queue = [(start, [start])]
-    visited = set()
+    Each cell is queued at most once and remembers the cell that queued it,
+    so the frontier holds plain cell indices and the path is rebuilt only
+    when the goal is reached.
+    """
+    tracer = Tracer(name, trace, sink)
+    full = tracer.full
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cells, coords = grid.cells, grid.coords
+    offsets = grid.offsets8 if diagonal else grid.offsets4
+    source, target = grid.index(start), grid.index(goal)
+
+    # A search from a blocked start finds nothing, as one towards a blocked goal does
+    queue = deque([] if cells[source] else [source])
+    queued = bytearray(grid.size)
+    queued[source] = 1
+    parent = array('q', [-1]) * grid.size
+    explored = []
 
     while queue:
-        vertex, path = queue.pop(0)
-
-        print("\n" + "="*40)
-        print(f"Current node: {vertex}")
-        print(f"Current path: {path}")
-        print("="*40)
-
-        if vertex in visited:
-            print(f"Node {vertex} already visited, skipping...")
-            continue
-        visited.add(vertex)
-        nodes_explored.add(vertex)
-
-        if vertex == goal:
+        vertex = queue.popleft()
+        explored.append(vertex)
+        if full:
+            tracer.emit(EXPAND, coords(vertex), coords(parent[vertex]) if parent[vertex] >= 0 else None)
+
+        if vertex == target:
+            path = _parent_path(grid, parent, vertex)
+            nodes_explored = _coords_set(grid, explored)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
-            print("\n----------------------------")
-            print("Goal Reached!")
-            print(f"Final Path: {path}")
-            print(f"Total nodes explored: {len(nodes_explored)}")
-            print(f"Execution time: {execution_time:.10f} seconds")
-            print("----------------------------")
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        for next_node in get_neighbors(vertex, grid):
-            if next_node not in visited:
-                new_path = list(path)
-                new_path.append(next_node)
-                queue.append((next_node, new_path))
-                
-                # User-friendly debug prints to understand the decision-making process
-                print("-" * 40)
-                print(f"Evaluating neighbor: {next_node}")
-                print(f"Updated path: {new_path}")
-                print("-" * 40)
-
-        print("Current queue: ", queue)
-        print("Current visited set: ", visited)
-        print("="*40 + "\n")
+        for offset in offsets:
+            next_node = vertex + offset
+            if not cells[next_node] and not queued[next_node]:
+                queued[next_node] = 1
+                parent[next_node] = vertex
+                queue.append(next_node)
+                if full:
+                    tracer.emit(PUSH, coords(next_node), coords(vertex))
 
+    nodes_explored = _coords_set(grid, explored)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    print("\n----------------------------")
-    print("No Path Found")
-    print(f"Total nodes explored: {len(nodes_explored)}")
-    print(f"Execution time: {execution_time:.10f} seconds")
-    print("----------------------------")
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
-def dijkstra(start, goal, grid):
+def branch_and_bound(start, goal, grid, trace=TRACE_OFF, sink=None):
+    return _breadth_first('Branch and Bound', start, goal, grid, True, trace, sink)
+
+def dijkstra(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    """Uniform-cost search, or goal-directed with an admissible ``heuristic``.
+
+    Passing e.g. a ``Landmarks`` heuristic keeps the result optimal while
+    steering the search towards the goal.
+    """
+    tracer = Tracer('Dijkstra', trace, sink)
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    cells, weights, steps, stride, coords = grid.cells, grid.weights, grid.steps8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    open_set = set([start])
     closed_set = set()
 
     came_from = {}
 
-    g_score = {start: 0}
+    g_score = {source: 0}
+
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, g_score[source])
 
     while open_set:
-        current = min(open_set, key=lambda o: g_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
-
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current])
+
+        current_g = g_score[current]
+        for offset, step in steps:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
                 continue
-            tentative_g_score = g_score[current] + 1
+            tentative_g_score = current_g + step * weights[neighbor]
 
             if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
                 continue
             else:
-                added_to_open_set = "No"
-
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
+                kind = RELAX
 
             came_from[neighbor] = current
             g_score[neighbor] = tentative_g_score
+            if heuristic is None:
+                open_set.push(neighbor, tentative_g_score)
+                if full:
+                    tracer.emit(kind, coords(neighbor), coords(current), tentative_g_score)
+            else:
+                f = tentative_g_score + heuristic(neighbor, target, stride)
+                open_set.push(neighbor, f)
+                if full:
+                    tracer.emit(kind, coords(neighbor), coords(current), tentative_g_score, f)
 
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print("-" * 40)
-
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
-
+    nodes_explored = _coords_set(grid, closed_set)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
 
-def greedy_best_first_search(start, goal, grid):
+def greedy_best_first_search(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    tracer = Tracer('Greedy Best First Search', trace, sink)
+    heuristic = heuristic or default_heuristic()
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    cells, offsets, stride, coords = grid.cells, grid.offsets8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    open_set = set([start])
     closed_set = set()
 
     came_from = {}
 
-    f_score = {start: heuristic(start, goal)}
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, heuristic(source, target, stride))
 
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), f=heuristic(current, target, stride))
 
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
                 continue
 
-            if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            else:
-                added_to_open_set = "No"
-
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"Added to open set: {added_to_open_set}")
-
             came_from[neighbor] = current
-            f_score[neighbor] = heuristic(neighbor, goal)
-
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
-
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+            # The heuristic never changes, so a queued node keeps its place
+            if neighbor not in open_set:
+                open_set.push(neighbor, heuristic(neighbor, target, stride))
+                if full:
+                    tracer.emit(PUSH, coords(neighbor), coords(current), f=open_set.priority(neighbor))
+            elif full:
+                tracer.emit(RELAX, coords(neighbor), coords(current), f=open_set.priority(neighbor))
 
+    nodes_explored = _coords_set(grid, closed_set)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
-def hierarchical_pathfinding(start, goal, grid):
-    start_time = time.perf_counter()
-    nodes_explored = set()
-
-    open_set = set([start])
-    closed_set = set()
-
-    came_from = {}
-
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-
-    while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-            end_time = time.perf_counter()
-            execution_time = end_time - start_time
-            return path, nodes_explored, execution_time
-
-        open_set.remove(current)
-        closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
-
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
-                continue
-
-            if current in came_from and line_of_sight(grid, came_from[current], neighbor):
-                tentative_g_score = g_score[came_from[current]] + heuristic(came_from[current], neighbor)
-            else:
-                tentative_g_score = g_score[current] + 1
-
-            if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
-                continue
-            else:
-                added_to_open_set = "No"
-
-            # User-friendly debug prints to understand the decision-making process
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
+def hierarchical_pathfinding(start, goal, grid, trace=TRACE_OFF, sink=None, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """HPA* over a cluster abstraction that is built once per map and cached.
 
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
-
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
+    Paths are near-optimal rather than optimal: the route through each
+    cluster is optimal, but clusters may only be crossed at their entrances.
+    """
+    tracer = Tracer('Hierarchical Pathfinding A*', trace, sink)
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    source, target = grid.index(start), grid.index(goal)
 
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+    graph = get_abstract_graph(grid, cluster_size)
+    path, explored = find_path(graph, grid, source, target, tracer)
 
+    path = [grid.coords(node) for node in path]
+    nodes_explored = _coords_set(grid, explored)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    return [], nodes_explored, execution_time
-
-
-def jump_point_search(start, goal, grid):
-    def get_jump_point(parent, node, grid):
-        x, y = node
-        px, py = parent
-        dx, dy = x - px, y - py
-
-        if not (0 <= x < len(grid) and 0 <= y < len(grid[0])) or grid[y][x] == 1:
-            return None
-
-        if node == goal:
+    tracer.summary(path, nodes_explored, execution_time)
+    return path, nodes_explored, execution_time
+
+
+# Jump Point Search helpers. Diagonal moves may cut corners, as they do in
+# get_neighbors, so the pruning and forced-neighbour rules below are the
+# ones for unrestricted diagonal movement.
+JPS_START_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+def _pruned_directions(cells, stride, node, dx, dy):
+    """Directions worth jumping in after reaching ``node`` moving ``(dx, dy)``."""
+    if dx and dy:
+        directions = [(0, dy), (dx, 0), (dx, dy)]
+        if cells[node - dx]:
+            directions.append((-dx, dy))
+        if cells[node - dy * stride]:
+            directions.append((dx, -dy))
+    elif dx:
+        directions = [(dx, 0)]
+        if cells[node + stride]:
+            directions.append((dx, 1))
+        if cells[node - stride]:
+            directions.append((dx, -1))
+    else:
+        directions = [(0, dy)]
+        if cells[node + 1]:
+            directions.append((1, dy))
+        if cells[node - 1]:
+            directions.append((-1, dy))
+    return directions
+
+def _jump_straight(cells, target, node, step, side):
+    while not cells[node]:
+        if node == target:
             return node
-
-        # Check for forced neighbors
-        if dx != 0 and dy != 0:  # Diagonal movement
-            if (grid[y][x - dx] == 1 and grid[y - dy][x] == 0) or (grid[y - dy][x] == 1 and grid[y][x - dx] == 0):
-                return node
-        elif dx != 0:  # Horizontal movement
-            if (0 <= y + 1 < len(grid) and grid[y + 1][x] == 0 and grid[y + 1][x - dx] == 1) or (0 <= y - 1 < len(grid) and grid[y - 1][x] == 0 and grid[y - 1][x - dx] == 1):
+        if (cells[node + side] and not cells[node + step + side]) or (cells[node - side] and not cells[node + step - side]):
+            return node
+        node += step
+    return None
+
+def _jump(cells, stride, target, node, dx, dy):
+    """Walk from ``node`` in direction ``(dx, dy)`` to the next jump point.
+
+    The walk is iterative, so corridor length is not bounded by the
+    recursion limit, and the blocked border ends it before it can leave
+    the grid.
+    """
+    if dx and dy:
+        step_y = dy * stride
+        step = dx + step_y
+        while not cells[node]:
+            if node == target:
                 return node
-        elif dy != 0:  # Vertical movement
-            if (0 <= x + 1 < len(grid[0]) and grid[y][x + 1] == 0 and grid[y - dy][x + 1] == 1) or (0 <= x - 1 < len(grid[0]) and grid[y][x - 1] == 0 and grid[y - dy][x - 1] == 1):
+            if (cells[node - dx] and not cells[node - dx + step_y]) or (cells[node - step_y] and not cells[node + dx - step_y]):
                 return node
-
-        # Check for jump points recursively
-        if dx != 0 and dy != 0:  # Diagonal
-            if get_jump_point(node, (x + dx, y), grid) or get_jump_point(node, (x, y + dy), grid):
+            if (_jump_straight(cells, target, node + dx, dx, stride) is not None
+                    or _jump_straight(cells, target, node + step_y, step_y, 1) is not None):
                 return node
-        if dx != 0:  # Horizontal
-            return get_jump_point(node, (x + dx, y), grid)
-        if dy != 0:  # Vertical
-            return get_jump_point(node, (x, y + dy), grid)
-
+            node += step
         return None
-
+    if dx:
+        return _jump_straight(cells, target, node, dx, stride)
+    return _jump_straight(cells, target, node, dy * stride, 1)
+
+def _require_uniform(grid, name):
+    # Jump points are only valid when every step along a line costs the same
+    if grid.weighted:
+        raise ValueError(f"{name} only supports grids without a cost layer")
+
+def jump_point_search(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    tracer = Tracer('Jump Point Search', trace, sink)
+    heuristic = heuristic or default_heuristic()
+    full = tracer.full
     start_time = time.perf_counter()
-    open_set = set([start])
+    grid = as_grid(grid)
+    _require_uniform(grid, 'Jump Point Search')
+    cells, stride, coords = grid.cells, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
+
     closed_set = set()
     came_from = {}
+    direction = {}
 
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    g_score = {source: 0}
+    f_score = {source: heuristic(source, target, stride)}
+
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, f_score[source])
 
-    print("\nStarting Jump Point Search Algorithm")
-    print("Initial Open Set: ", open_set)
-    
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
-            print("\n----------------------------")
-            print("Goal Reached!")
-            print(f"Final Path: {path}")
-            print("----------------------------")
-            return path, closed_set, execution_time
+            tracer.summary(path, nodes_explored, execution_time)
+            return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
-
-        for direction in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            neighbor = (current[0] + direction[0], current[1] + direction[1])
-            jump_point = get_jump_point(current, neighbor, grid)
-            if not jump_point or jump_point in closed_set:
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current], f_score[current])
+
+        if current in direction:
+            directions = _pruned_directions(cells, stride, current, *direction[current])
+        else:
+            directions = JPS_START_DIRECTIONS
+        current_g = g_score[current]
+        for dx, dy in directions:
+            jump_point = _jump(cells, stride, target, current + dy * stride + dx, dx, dy)
+            if jump_point is None or jump_point in closed_set:
                 continue
 
-            tentative_g_score = g_score[current] + heuristic(current, jump_point)
-            if jump_point not in open_set:
-                open_set.add(jump_point)
-                added_to_open_set = "Yes"
-            else:
-                added_to_open_set = "No"
-            
-            print("-" * 40)
-            print(f"Evaluating jump point: {jump_point}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of jump point: {g_score.get(jump_point, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
+            tentative_g_score = current_g + octile(current, jump_point, stride)
+            if tentative_g_score >= g_score.get(jump_point, float('inf')):
+                continue
 
             came_from[jump_point] = current
+            direction[jump_point] = (dx, dy)
             g_score[jump_point] = tentative_g_score
-            f_score[jump_point] = g_score[jump_point] + heuristic(jump_point, goal)
-
-            print(f"Updated g_score: {g_score[jump_point]}")
-            print(f"Updated f_score: {f_score[jump_point]}")
-            print("-" * 40)
-
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+            f_score[jump_point] = tentative_g_score + heuristic(jump_point, target, stride)
+            open_set.push(jump_point, f_score[jump_point])
+            if full:
+                tracer.emit(JUMP, coords(jump_point), coords(current), g_score[jump_point], f_score[jump_point])
 
+    nodes_explored = _coords_set(grid, closed_set)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    print("\n----------------------------")
-    print("No Path Found")
-    print("----------------------------")
-    return [], closed_set, execution_time
+    tracer.summary([], nodes_explored, execution_time)
+    return [], nodes_explored, execution_time
+
+def jump_point_search_plus(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    """JPS+ : Jump Point Search over precomputed per-cell jump distances.
 
-def dynamic_astar(start, goal, grid):
+    The distance tables are built once per map and cached by grid
+    fingerprint, so every later query on the same static map replaces the
+    jump scans with one table lookup per direction.
+    """
+    tracer = Tracer('JPS+', trace, sink)
+    heuristic = heuristic or default_heuristic()
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    _require_uniform(grid, 'JPS+')
+    cells, stride, coords = grid.cells, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
+    tables = [memoryview(table) for table in get_jump_distances(grid)]
+    direction_index = {direction: k for k, direction in enumerate(DIRECTIONS_8)}
+    goal_y, goal_x = divmod(target, stride)
 
-    open_set = set([start])
     closed_set = set()
-
     came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    direction = {}
+
+    g_score = {source: 0}
+    f_score = {source: heuristic(source, target, stride)}
 
-    def update_grid_with_changes(grid, changes):
-        for change in changes:
-            x, y, new_value = change
-            grid[y][x] = new_value
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, f_score[source])
 
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
-
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current], f_score[current])
+
+        if current in direction:
+            directions = _pruned_directions(cells, stride, current, *direction[current])
+        else:
+            directions = JPS_START_DIRECTIONS
+        y, x = divmod(current, stride)
+        current_g = g_score[current]
+        for dx, dy in directions:
+            distance = tables[direction_index[(dx, dy)]][current]
+            # A goal lying along the move is reached before any jump point
+            # beyond it, or before the wall
+            ahead_x = (goal_x - x) * dx
+            ahead_y = (goal_y - y) * dy
+            if dx and dy:
+                steps = min(ahead_x, ahead_y)
+                if ahead_x <= 0 or ahead_y <= 0 or steps > abs(distance):
+                    steps = distance
+            elif dx:
+                steps = ahead_x if goal_y == y and 0 < ahead_x <= abs(distance) else distance
+            else:
+                steps = ahead_y if goal_x == x and 0 < ahead_y <= abs(distance) else distance
+            if steps <= 0:
                 continue
-            tentative_g_score = g_score[current] + 1
 
-            if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
+            jump_point = current + steps * (dy * stride + dx)
+            if jump_point in closed_set:
+                continue
+            tentative_g_score = current_g + steps * (SQRT2 if dx and dy else 1)
+            if tentative_g_score >= g_score.get(jump_point, float('inf')):
                 continue
-            else:
-                added_to_open_set = "No"
-
-            # User-friendly debug prints to understand the decision-making process
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
-
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
 
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
+            came_from[jump_point] = current
+            direction[jump_point] = (dx, dy)
+            g_score[jump_point] = tentative_g_score
+            f_score[jump_point] = tentative_g_score + heuristic(jump_point, target, stride)
+            open_set.push(jump_point, f_score[jump_point])
+            if full:
+                tracer.emit(JUMP, coords(jump_point), coords(current), g_score[jump_point], f_score[jump_point])
 
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+    nodes_explored = _coords_set(grid, closed_set)
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
+    return [], nodes_explored, execution_time
 
-        # Simulate grid changes
-        grid_changes = []
-        if grid_changes:
-            print("Updating grid with changes...")
-            update_grid_with_changes(grid, grid_changes)
+def dynamic_astar(start, goal, grid, trace=TRACE_OFF, sink=None):
+    """One-shot run of the incremental D* Lite planner.
 
+    Callers that replan after obstacle edits should keep a ``DStarLite``
+    around and use ``update_cells``/``replan`` instead.
+    """
+    tracer = Tracer('Dynamic A*', trace, sink)
+    start_time = time.perf_counter()
+    planner = DStarLite(grid, start, goal, tracer)
+    path = planner.replan()
+    nodes_explored = _coords_set(planner.grid, planner.expanded)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    return [], nodes_explored, execution_time
+    tracer.summary(path, nodes_explored, execution_time)
+    return path, nodes_explored, execution_time
 
-def theta_star(start, goal, grid):
+def theta_star(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    tracer = Tracer('Theta*', trace, sink)
+    heuristic = heuristic or default_heuristic(any_angle=True)
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    cells, weights, steps, stride, coords = grid.cells, grid.weights, grid.steps8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    open_set = set([start])
     closed_set = set()
 
     came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    g_score = {source: 0}
+    f_score = {source: heuristic(source, target, stride)}
+
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, f_score[source])
 
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
-
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
+        parent = came_from.get(current)
+        if full:
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current], f_score[current])
 
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+        for offset, step in steps:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
                 continue
 
-            if (current in came_from and line_of_sight(grid, came_from[current], neighbor)):
-                tentative_g_score = g_score[came_from[current]] + heuristic(came_from[current], neighbor)
+            # Link to the parent of ``current`` directly when it can see the neighbour
+            if parent is not None and _line_of_sight(cells, stride, parent, neighbor):
+                predecessor = parent
+                tentative_g_score = g_score[parent] + _line_cost(grid, parent, neighbor)
             else:
-                tentative_g_score = g_score[current] + heuristic(current, neighbor)
+                predecessor = current
+                tentative_g_score = g_score[current] + step * weights[neighbor]
 
             if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
                 continue
             else:
-                added_to_open_set = "No"
+                kind = RELAX
 
-            # User-friendly debug prints to understand the decision-making process
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
-
-            came_from[neighbor] = current
+            came_from[neighbor] = predecessor
             g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
-
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
-
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+            f_score[neighbor] = tentative_g_score + heuristic(neighbor, target, stride)
+            open_set.push(neighbor, f_score[neighbor])
+            if full:
+                tracer.emit(kind, coords(neighbor), coords(predecessor), g_score[neighbor], f_score[neighbor])
 
+    nodes_explored = _coords_set(grid, closed_set)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
-def bfs(start, goal, grid):
-    start_time = time.perf_counter()
-    nodes_explored = set()
-    queue = [(start, [start])]
-    visited = set()
-
-    print("\nStarting Breadth-First Search Algorithm")
-    print(f"Start node: {start}, Goal node: {goal}")
-    print("Initial Queue: ", queue)
-    
-    while queue:
-        (vertex, path) = queue.pop(0)
-        if vertex in visited:
-            continue
-        visited.add(vertex)
-        nodes_explored.add(vertex)
-
-        print("\n" + "="*40)
-        print(f"Current node: {vertex}")
-        print(f"Current path: {path}")
-        print("="*40)
+def bfs(start, goal, grid, trace=TRACE_OFF, sink=None):
+    return _breadth_first('Breadth-First Search (BFS)', start, goal, grid, False, trace, sink)
 
-        if vertex == goal:
-            end_time = time.perf_counter()
-            execution_time = end_time - start_time
-            print("\n" + "="*40)
-            print("Goal Reached!")
-            print(f"Final Path: {path}")
-            print(f"Nodes explored: {len(nodes_explored)}")
-            print(f"Execution time: {execution_time:.10f} seconds")
-            print("="*40)
-            return path, nodes_explored, execution_time
-
-        for next_node in get_neighbors_no_diagonals(vertex, grid):
-            if next_node not in visited:
-                new_path = list(path)
-                new_path.append(next_node)
-                queue.append((next_node, new_path))
-                print("-" * 40)
-                print(f"Evaluating neighbor: {next_node}")
-                print(f"New path: {new_path}")
-                print(f"Queue: {queue}")
-                print("-" * 40)
+def dfs(start, goal, grid, trace=TRACE_OFF, sink=None):
+    tracer = Tracer('Depth-First Search (DFS)', trace, sink)
+    full = tracer.full
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cells, offsets, coords = grid.cells, grid.offsets4, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    end_time = time.perf_counter()
-    execution_time = end_time - start_time
-    print("\n" + "="*40)
-    print("No Path Found")
-    print("="*40)
-    return [], nodes_explored, execution_time
+    # A cell may sit on the stack several times; the copy popped first wins
+    # and records which cell pushed it
+    stack = [] if cells[source] else [(source, -1)]
+    visited = bytearray(grid.size)
+    parent = array('q', [-1]) * grid.size
+    explored = []
 
-def dfs(start, goal, grid):
-    start_time = time.perf_counter()
-    nodes_explored = set()
-    stack = [(start, [start])]
-    visited = set()
-
-    print("\nStarting Depth-First Search Algorithm")
-    print(f"Start node: {start}, Goal node: {goal}")
-    print("Initial Stack: ", stack)
-    
     while stack:
-        (vertex, path) = stack.pop()
-        if vertex in visited:
+        vertex, pushed_by = stack.pop()
+        if visited[vertex]:
             continue
-        visited.add(vertex)
-        nodes_explored.add(vertex)
-
-        print("\n" + "="*40)
-        print(f"Current node: {vertex}")
-        print(f"Current path: {path}")
-        print("="*40)
-
-        if vertex == goal:
+        visited[vertex] = 1
+        parent[vertex] = pushed_by
+        explored.append(vertex)
+        if full:
+            tracer.emit(EXPAND, coords(vertex), coords(pushed_by) if pushed_by >= 0 else None)
+
+        if vertex == target:
+            path = _parent_path(grid, parent, vertex)
+            nodes_explored = _coords_set(grid, explored)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
-            print("\n" + "="*40)
-            print("Goal Reached!")
-            print(f"Final Path: {path}")
-            print(f"Nodes explored: {len(nodes_explored)}")
-            print(f"Execution time: {execution_time:.10f} seconds")
-            print("="*40)
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        for next_node in get_neighbors_no_diagonals(vertex, grid):
-            if next_node not in visited:
-                new_path = list(path)
-                new_path.append(next_node)
-                stack.append((next_node, new_path))
-                print("-" * 40)
-                print(f"Evaluating neighbor: {next_node}")
-                print(f"New path: {new_path}")
-                print(f"Stack: {stack}")
-                print("-" * 40)
+        for offset in offsets:
+            next_node = vertex + offset
+            if not cells[next_node] and not visited[next_node]:
+                stack.append((next_node, vertex))
+                if full:
+                    tracer.emit(PUSH, coords(next_node), coords(vertex))
 
+    nodes_explored = _coords_set(grid, explored)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    print("\n" + "="*40)
-    print("No Path Found")
-    print("="*40)
+    tracer.summary([], nodes_explored, execution_time)
     return [], nodes_explored, execution_time
 
-def swarm_algorithm(start, goal, grid):
+def swarm_algorithm(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    tracer = Tracer('Swarm Algorithm', trace, sink)
+    # Manhattan overestimates diagonal moves, which is what pulls the swarm
+    # straight at the goal instead of spreading out like A*
+    heuristic = heuristic or manhattan
+    full = tracer.full
     start_time = time.perf_counter()
-    nodes_explored = set()
+    grid = as_grid(grid)
+    cells, weights, steps, stride, coords = grid.cells, grid.weights, grid.steps8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
 
-    open_set = set([start])
     closed_set = set()
 
     came_from = {}
 
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+    g_score = {source: 0}
+    f_score = {source: heuristic(source, target, stride)}
+
+    open_set = OpenList()
+    if not cells[source]:
+        open_set.push(source, f_score[source])
 
     while open_set:
-        current = min(open_set, key=lambda o: f_score[o])
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
+        current = open_set.pop()
+        if current == target:
+            path = _reconstruct_path(grid, came_from, current)
+            nodes_explored = _coords_set(grid, closed_set)
             end_time = time.perf_counter()
             execution_time = end_time - start_time
+            tracer.summary(path, nodes_explored, execution_time)
             return path, nodes_explored, execution_time
 
-        open_set.remove(current)
         closed_set.add(current)
-        nodes_explored.add(current)
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current], f_score[current])
+
+        current_g = g_score[current]
+        for offset, step in steps:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
+                continue
 
-        print("\n" + "="*40)
-        print(f"Current node: {current}")
-        print("="*40)
+            tentative_g_score = current_g + step * weights[neighbor]
 
-        for neighbor in get_neighbors(current, grid):
-            if neighbor in closed_set:
+            if neighbor not in open_set:
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
                 continue
+            else:
+                kind = RELAX
+
+            came_from[neighbor] = current
+            g_score[neighbor] = tentative_g_score
+            f_score[neighbor] = tentative_g_score + heuristic(neighbor, target, stride)
+            open_set.push(neighbor, f_score[neighbor])
+            if full:
+                tracer.emit(kind, coords(neighbor), coords(current), g_score[neighbor], f_score[neighbor])
 
-            tentative_g_score = g_score[current] + 1
+    nodes_explored = _coords_set(grid, closed_set)
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    tracer.summary([], nodes_explored, execution_time)
+    return [], nodes_explored, execution_time
+
+
+def _meeting_path(grid, forward_parents, backward_parents, meet):
+    path = _reconstruct_path(grid, forward_parents, meet)
+    backward = _reconstruct_path(grid, backward_parents, meet)
+    backward.reverse()
+    return path + backward[1:]
+
+def _bidirectional_best_first(name, start, goal, grid, heuristic, trace, sink):
+    """Shared meet-in-the-middle search behind the bidirectional A* and Dijkstra.
+
+    Each direction keeps its own open list, g-scores and parents, and the
+    side with the smaller open list is expanded next, which keeps a side
+    stuck behind obstacles from growing alone. ``best`` is the cheapest
+    start-to-goal path seen through a node labelled by both sides, and the
+    search stops once the two top keys sum to it.
+
+    A* keys add the balanced potential ``(h(v, goal) - h(start, v)) / 2``
+    forwards and its negation backwards. With a consistent ``heuristic``
+    both potentials are consistent and always sum to zero, so the two sides
+    expand towards each other and the Dijkstra stop test still holds. A
+    separate estimate per side, each stopped by its own f-score, grows two
+    A* searches that each cover about as much of the map as one-directional
+    A*. Directed heuristics such as ``Landmarks`` are read in the direction
+    they estimate.
+
+    Entering a cell costs its weight, so the backward side, which walks the
+    edges in reverse, charges the cell it leaves rather than the one it
+    reaches.
+    """
+    tracer = Tracer(name, trace, sink)
+    full = tracer.full
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cells, weights, steps, stride, coords = grid.cells, grid.weights, grid.steps8, grid.stride, grid.coords
+    source, target = grid.index(start), grid.index(goal)
+
+    if heuristic:
+        def potential(node):
+            return (heuristic(node, target, stride) - heuristic(source, node, stride)) / 2
+    else:
+        def potential(node):
+            return 0
+
+    g_scores = ({source: 0}, {target: 0})
+    parents = ({}, {})
+    closed_sets = (set(), set())
+    open_sets = (OpenList(), OpenList())
+    if not cells[source]:
+        open_sets[0].push(source, potential(source))
+    # A blocked goal is never entered, so the backward side has nothing to grow
+    if not cells[target]:
+        open_sets[1].push(target, -potential(target))
+    best, meet = (0, source) if source == target and not cells[source] else (float('inf'), None)
+
+    while open_sets[0] and open_sets[1]:
+        forward_top, backward_top = open_sets[0].peek_priority(), open_sets[1].peek_priority()
+        if best <= forward_top + backward_top:
+            break
+
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, closed_set = open_sets[side], closed_sets[side]
+        g_score, came_from, other_g_score = g_scores[side], parents[side], g_scores[1 - side]
+        current = open_set.pop()
+        closed_set.add(current)
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current])
+
+        current_g = g_score[current]
+        current_weight = weights[current]
+        for offset, step in steps:
+            neighbor = current + offset
+            if cells[neighbor] or neighbor in closed_set:
+                continue
+            tentative_g_score = current_g + step * (weights[neighbor] if side == 0 else current_weight)
 
             if neighbor not in open_set:
-                open_set.add(neighbor)
-                added_to_open_set = "Yes"
-            elif tentative_g_score >= g_score.get(neighbor, float('inf')):
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
                 continue
             else:
-                added_to_open_set = "No"
-
-            # User-friendly debug prints to understand the decision-making process
-            print("-" * 40)
-            print(f"Evaluating neighbor: {neighbor}")
-            print(f"tentative_g_score: {tentative_g_score}")
-            print(f"current g_score of neighbor: {g_score.get(neighbor, float('inf'))}")
-            print(f"Added to open set: {added_to_open_set}")
+                kind = RELAX
 
             came_from[neighbor] = current
             g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
+            f = tentative_g_score + potential(neighbor) if side == 0 else tentative_g_score - potential(neighbor)
+            open_set.push(neighbor, f)
+            if full:
+                tracer.emit(kind, coords(neighbor), coords(current), tentative_g_score, f)
 
-            print(f"Updated g_score: {g_score[neighbor]}")
-            print(f"Updated f_score: {f_score[neighbor]}")
-            print("-" * 40)
+            other_g = other_g_score.get(neighbor)
+            if other_g is not None and tentative_g_score + other_g < best:
+                best, meet = tentative_g_score + other_g, neighbor
 
-        print("Current open set: ", open_set)
-        print("Current closed set: ", closed_set)
-        print("="*40 + "\n")
+    path = _meeting_path(grid, parents[0], parents[1], meet) if meet is not None else []
+    nodes_explored = _coords_set(grid, closed_sets[0] | closed_sets[1])
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    tracer.summary(path, nodes_explored, execution_time)
+    return path, nodes_explored, execution_time
 
+def bidirectional_astar(start, goal, grid, trace=TRACE_OFF, sink=None, heuristic=None):
+    return _bidirectional_best_first('Bidirectional A*', start, goal, grid, heuristic or default_heuristic(),
+                                     trace, sink)
+
+def bidirectional_dijkstra(start, goal, grid, trace=TRACE_OFF, sink=None):
+    return _bidirectional_best_first('Bidirectional Dijkstra', start, goal, grid, None, trace, sink)
+
+def bidirectional_bfs(start, goal, grid, trace=TRACE_OFF, sink=None):
+    """Four-connected BFS grown a whole layer at a time from both ends.
+
+    The side with the smaller frontier grows next. A layer that touches the
+    other side is finished before stopping, keeping the meeting node with
+    the shortest total distance.
+    """
+    tracer = Tracer('Bidirectional BFS', trace, sink)
+    full = tracer.full
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    cells, offsets, coords = grid.cells, grid.offsets4, grid.coords
+    source, target = grid.index(start), grid.index(goal)
+
+    distances = ({source: 0}, {target: 0})
+    parents = ({}, {})
+    frontiers = [[] if cells[source] else [source], [] if cells[target] else [target]]
+    explored = []
+    best, meet = (0, source) if source == target and not cells[source] else (float('inf'), None)
+
+    while meet is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        distance, came_from, other_distance = distances[side], parents[side], distances[1 - side]
+        next_frontier = []
+        for vertex in frontiers[side]:
+            explored.append(vertex)
+            if full:
+                parent = came_from.get(vertex)
+                tracer.emit(EXPAND, coords(vertex), parent and coords(parent), distance[vertex])
+            step = distance[vertex] + 1
+            for offset in offsets:
+                next_node = vertex + offset
+                if cells[next_node] or next_node in distance:
+                    continue
+                distance[next_node] = step
+                came_from[next_node] = vertex
+                next_frontier.append(next_node)
+                if full:
+                    tracer.emit(PUSH, coords(next_node), coords(vertex), step)
+                other = other_distance.get(next_node)
+                if other is not None and step + other < best:
+                    best, meet = step + other, next_node
+        frontiers[side] = next_frontier
+
+    path = _meeting_path(grid, parents[0], parents[1], meet) if meet is not None else []
+    nodes_explored = _coords_set(grid, explored)
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
+    tracer.summary(path, nodes_explored, execution_time)
+    return path, nodes_explored, execution_time
+
+
+def flow_field(start, goal, grid, trace=TRACE_OFF, sink=None):
+    """Follow the cached distance field towards ``goal`` from ``start``.
+
+    The first query for a goal pays for the whole field; later queries to
+    the same goal only walk their path, which is also all they report as
+    explored.
+    """
+    tracer = Tracer('Flow Field', trace, sink)
+    start_time = time.perf_counter()
+    grid = as_grid(grid)
+    grid.index(start)
+    path = get_distance_field(grid, goal).path_from(start)
+    nodes_explored = set(path)
     end_time = time.perf_counter()
     execution_time = end_time - start_time
-    return [], nodes_explored, execution_time
\ No newline at end of file
+    tracer.summary(path, nodes_explored, execution_time)
+    return path, nodes_explored, execution_time
+
+
+def path_cost(path, grid=None):
+    """Length of a path, with diagonal steps costing sqrt(2).
+
+    Segments longer than one step (jump points, any-angle paths) count their
+    straight-line length. On a ``grid`` with a cost layer each segment is
+    also scaled by the weights of the cells it enters.
+    """
+    if grid is not None and grid.weighted:
+        index = grid.index
+        return sum(_line_cost(grid, index(a), index(b)) for a, b in zip(path, path[1:]))
+    cost = 0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        cost += math.hypot(x1 - x0, y1 - y0)
+    return cost
+
+
+# Registry of every search the UI, CLI and benchmark can run, in menu order.
+#   diagonal     moves to all eight neighbours (otherwise four)
+#   any_angle    paths may jump between any two mutually visible cells
+#   incremental  can repair an earlier search after obstacle edits
+#   weighted     honours per-cell movement costs
+#   optimal      always returns a cheapest path under the octile cost model
+#   local        only reads cells next to the nodes it expands
+#   heuristic    takes a ``heuristic=`` argument (see heuristics.py)
+#   counterpart  the one-directional search a bidirectional one is measured against
+AlgorithmInfo = namedtuple('AlgorithmInfo', [
+    'name', 'function', 'diagonal', 'any_angle', 'incremental', 'weighted', 'optimal', 'local',
+    'heuristic', 'video', 'counterpart',
+], defaults=(True, False, False, False, False, False, False, None, None))
+
+REGISTRY = {}
+
+
+def register(info):
+    """Add an ``AlgorithmInfo`` to the registry, replacing any with the same name."""
+    REGISTRY[info.name] = info
+    return info
+
+
+for _info in (
+    AlgorithmInfo('A*', astar, weighted=True, optimal=True, local=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=JtiK0DOeI4A"),
+    AlgorithmInfo('Branch and Bound', branch_and_bound, local=True,
+                  video="https://www.youtube.com/watch?v=3RBNPc0_Q6g"),
+    AlgorithmInfo('Dijkstra', dijkstra, weighted=True, optimal=True, local=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=GazC3A4OQTE"),
+    AlgorithmInfo('Greedy Best First Search', greedy_best_first_search, local=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=dv1m3L6QXWs"),
+    AlgorithmInfo('Hierarchical Pathfinding A*', hierarchical_pathfinding, weighted=True,
+                  video="https://www.youtube.com/watch?v=zrX-67WkK6Y"),
+    AlgorithmInfo('Jump Point Search', jump_point_search, optimal=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=__ZLnTwYNPk"),
+    AlgorithmInfo('JPS+', jump_point_search_plus, optimal=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=__ZLnTwYNPk"),
+    AlgorithmInfo('Dynamic A*', dynamic_astar, incremental=True, weighted=True, optimal=True,
+                  video="https://www.youtube.com/watch?v=JtiK0DOeI4A"),
+    AlgorithmInfo('Theta*', theta_star, any_angle=True, weighted=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=mAaYVTedqPQ"),
+    AlgorithmInfo('Breadth-First Search (BFS)', bfs, diagonal=False, optimal=True, local=True,
+                  video="https://www.youtube.com/watch?v=oDqjPvD54Ss"),
+    AlgorithmInfo('Depth-First Search (DFS)', dfs, diagonal=False, local=True,
+                  video="https://www.youtube.com/watch?v=7fujbpJ0LB4"),
+    AlgorithmInfo('Swarm Algorithm', swarm_algorithm, weighted=True, local=True, heuristic=True,
+                  video="https://www.youtube.com/watch?v=SMq-dy8Hx-Y"),
+    AlgorithmInfo('Flow Field', flow_field, weighted=True, optimal=True),
+    AlgorithmInfo('Bidirectional A*', bidirectional_astar, weighted=True, optimal=True, local=True,
+                  heuristic=True, counterpart='A*'),
+    AlgorithmInfo('Bidirectional Dijkstra', bidirectional_dijkstra, weighted=True, optimal=True, local=True,
+                  counterpart='Dijkstra'),
+    AlgorithmInfo('Bidirectional BFS', bidirectional_bfs, diagonal=False, optimal=True, local=True,
+                  counterpart='Breadth-First Search (BFS)'),
+):
+    register(_info)
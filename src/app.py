@@ -1,6 +1,6 @@
 import sys
-import re 
 import random
+import time
 import os
 import webbrowser
 
@@ -25,14 +25,27 @@ from kivy.logger import Logger
 Logger.setLevel('DEBUG')
 
 from kivy.clock import Clock
-from kivy.graphics import Color, Line, Ellipse
 
 from random import choice
 
-from algorithms import astar, branch_and_bound, dijkstra, greedy_best_first_search, hierarchical_pathfinding, jump_point_search, dynamic_astar, theta_star, bfs, dfs, swarm_algorithm
-from grid_components import Cell
-from utilities import TextOutput, get_grid_state
+from algorithms import REGISTRY
+from dstar_lite import DStarLite
+from grid import OccupancyGrid
+from grid_editor import GridEditor
+from grid_view import GridView
+from utilities import TextOutput
 from constants import predefined_grids
+from path_cache import PathCache
+from run_log import LOG_DIR, RUN_LOG_SUFFIX, RunLog, log_name
+from search_worker import SearchWorker
+from tracing import TRACE_FULL, PrintSink, TeeSink, Tracer
+
+# How often the UI picks up progress from a running search
+PROGRESS_INTERVAL = 1 / 20
+# Longer paths are revealed several cells per frame to finish in this many frames
+PATH_ANIMATION_FRAMES = 60
+# Width and height of the manual grid
+MANUAL_GRID_SIZE = (10, 10)
 
 class MatrixColumn(Label):
     def __init__(self, **kwargs):
@@ -196,19 +209,7 @@ class IntroductionScreen(Screen):
 
     def open_edu_videos(self, instance):
         dropdown = DropDown()
-        youtube_links = {
-            "A*": "https://www.youtube.com/watch?v=JtiK0DOeI4A",
-            "Branch and Bound": "https://www.youtube.com/watch?v=3RBNPc0_Q6g",
-            "Dijkstra": "https://www.youtube.com/watch?v=GazC3A4OQTE",
-            "Greedy Best First Search": "https://www.youtube.com/watch?v=dv1m3L6QXWs",
-            "Hierarchical Pathfinding A*": "https://www.youtube.com/watch?v=zrX-67WkK6Y",
-            "Jump Point Search": "https://www.youtube.com/watch?v=__ZLnTwYNPk",
-            "Dynamic A*": "https://www.youtube.com/watch?v=JtiK0DOeI4A",
-            "Theta*": "https://www.youtube.com/watch?v=mAaYVTedqPQ",
-            "Breadth-First Search (BFS)": "https://www.youtube.com/watch?v=oDqjPvD54Ss",
-            "Depth-First Search (DFS)": "https://www.youtube.com/watch?v=7fujbpJ0LB4",
-            "Swarm Algorithm": "https://www.youtube.com/watch?v=SMq-dy8Hx-Y"
-        }
+        youtube_links = {info.name: info.video for info in REGISTRY.values() if info.video}
 
         for title, url in youtube_links.items():
             btn = Button(text=title, size_hint_y=None, height=44)
@@ -228,19 +229,177 @@ class IntroductionScreen(Screen):
     def open_youtube_link(self, url):
         webbrowser.open(url)
 
-class MainScreen(Screen):
+class SearchScreen(Screen):
+    """Base for the screens that run searches on a GridView.
+
+    Searches run on a SearchWorker thread; a Clock interval streams their
+    explored nodes to the view and their progress to ``progress_label``
+    until they finish or are cancelled. Subclasses build the widgets with
+    ``build_run_controls`` and call ``start_search`` from their Run button.
+    """
+
+    def __init__(self, **kwargs):
+        super(SearchScreen, self).__init__(**kwargs)
+        self.path_cache = PathCache()
+        self.search = None
+        self.run_log = None
+
+    def build_run_controls(self, side_menu):
+        run_button = Button(
+            text='Run',
+            size_hint=(1, None),
+            height=44
+        )
+        run_button.bind(on_press=self.run_algorithm)
+
+        self.cancel_button = Button(
+            text='Cancel',
+            size_hint=(1, None),
+            height=44,
+            disabled=True
+        )
+        self.cancel_button.bind(on_press=self.cancel_search)
+
+        run_layout = BoxLayout(orientation='horizontal', size_hint=(1, None), height=44)
+        run_layout.add_widget(run_button)
+        run_layout.add_widget(self.cancel_button)
+
+        self.progress_label = Label(text='', size_hint=(1, None), height=30)
+
+        side_menu.add_widget(run_layout)
+        side_menu.add_widget(self.progress_label)
+
+    def clear_path(self, *args):
+        Clock.unschedule(self.animate_path)
+        self.grid_view.clear_search()
+
+    def display_path(self, path):
+        self.path_index = 0
+        self.path = path
+        Clock.schedule_interval(self.animate_path, 1 / 30)  # FPS
+
+    def animate_path(self, dt):
+        if self.path_index < len(self.path):
+            step = max(1, len(self.path) // PATH_ANIMATION_FRAMES)
+            self.grid_view.add_path(self.path[self.path_index:self.path_index + step])
+            self.path_index += step
+        else:
+            Clock.unschedule(self.animate_path)
+
+    def show_popup(self, title, message):
+        popup = Popup(title=title, content=Label(text=message), size_hint=(None, None), size=(400, 200))
+        popup.open()
+
+    def on_algorithm_select(self, spinner, text):
+        self.cancel_search()
+        self.clear_path()
+        self.selected_algorithm = text
+
+    def solve_cached(self, algorithm, start_point, goal_point, grid_state):
+        """A ``start_search`` callable that runs the search through the path cache."""
+        def solve(sink):
+            hits = self.path_cache.hits
+            result = self.path_cache.solve(algorithm, start_point, goal_point, grid_state,
+                                           trace=TRACE_FULL, sink=sink)
+            return result, self.path_cache.hits > hits
+        return solve
+
+    def start_search(self, name, algorithm, solve, start_point, goal_point):
+        """Run ``solve(sink)`` on a worker; it returns ``(result, cached)``."""
+        # Trace events are printed and streamed to this run's log file
+        self.run_log = RunLog.start(name, algorithm, start=start_point, goal=goal_point)
+        self.search = SearchWorker(solve, TeeSink(PrintSink(), self.run_log)).start()
+        self.cancel_button.disabled = False
+        self.progress_label.text = f"Running {algorithm}..."
+        Clock.schedule_interval(self.poll_search, PROGRESS_INTERVAL)
+
+    def cancel_search(self, *args):
+        """Stop the running search, if any, and wait for it to end.
+
+        A search ends at its next trace event, but work without events,
+        such as a flow field or an HPA* or JPS+ table build, runs to the
+        end. Waiting keeps edits and cache updates on this thread from
+        overlapping with the worker's reads and cache writes.
+        """
+        if self.search is None:
+            return
+        self.search.cancel()
+        self.search.join()
+        self.run_log.record({'kind': 'cancelled', 'nodes_expanded': self.search.expanded})
+        self.finish_search()
+        print("Search cancelled.")
+        self.progress_label.text = "Cancelled"
+
+    def finish_search(self):
+        Clock.unschedule(self.poll_search)
+        self.search = None
+        self.run_log.close()
+        self.cancel_button.disabled = True
+
+    def poll_search(self, dt):
+        search = self.search
+        if search is None:
+            return False
+        self.grid_view.add_explored(search.take_explored())
+        if not search.done.is_set():
+            self.progress_label.text = f"Nodes expanded: {search.expanded}"
+            return
+        self.finish_search()
+        self.progress_label.text = ''
+
+        if search.error is not None:
+            error = search.error[1]
+            print(f"Error running algorithm: {error}")
+            import traceback
+            traceback.print_exception(*search.error)
+            self.show_popup("Error", f"An error occurred while running the algorithm:\n{error}")
+            return
+
+        (path, explored_nodes, execution_time), cached = search.result
+        if cached:
+            print("Result served from the path cache.")
+        if path:
+            print(f"Path found: {path}")
+            print(f"Nodes explored: {len(explored_nodes)}")
+            print(f"Execution time: {execution_time:.10f} seconds")
+            self.display_explored_nodes(explored_nodes)  # Display explored nodes
+            self.display_path(path)
+        else:
+            self.grid_view.clear_search()
+            print("No path found.")
+
+    def display_explored_nodes(self, explored_nodes):
+        self.grid_view.add_explored(explored_nodes)
+
+    def save_logs(self, name):
+        try:
+            # Create the directory for console logs if it does not exist
+            os.makedirs(LOG_DIR, exist_ok=True)
+
+            # Save the full console log, not just the lines on screen
+            file_path = os.path.join(LOG_DIR, name + '.txt')
+            self.console.save(file_path)
+            print(f"Console output saved to {file_path}")
+
+            # The run's trace is already on disk; keep a copy out of rotation
+            if self.run_log is not None:
+                run_path = os.path.join(LOG_DIR, name + RUN_LOG_SUFFIX)
+                self.run_log.copy_to(run_path)
+                print(f"Run log saved to {run_path}")
+        except Exception as e:
+            print(f"Error saving console output: {e}")
+
+    def clear_console(self):
+        self.console.clear()
+
+class MainScreen(SearchScreen):
     def __init__(self, **kwargs):
         super(MainScreen, self).__init__(**kwargs)
 
         self.predefined_grids = predefined_grids
         main_layout = BoxLayout(orientation='horizontal')
 
-        self.grid_layout = GridLayout(cols=10, rows=10, size_hint=(.7, 1))   #Grid size
-        for y in range(10):
-            for x in range(10):
-                cell = Cell()
-                cell.position = (x, y)
-                self.grid_layout.add_widget(cell)
+        self.grid_view = GridView(size_hint=(.7, 1))
 
         side_menu = BoxLayout(orientation='vertical', size_hint=(.3, 1))
         self.grid_selector = Spinner(
@@ -253,19 +412,12 @@ class MainScreen(Screen):
 
         algorithm_spinner = Spinner(
             text='Select Algorithm',
-            values=('A*', 'Branch and Bound', 'Dijkstra', 'Greedy Best First Search', 'Hierarchical Pathfinding A*', 'Jump Point Search', 'Dynamic A*', 'Theta*', 'Breadth-First Search (BFS)', 'Depth-First Search (DFS)', 'Swarm Algorithm'),
+            values=tuple(REGISTRY),
             size_hint=(1, None),
             height=44
         )
         algorithm_spinner.bind(text=self.on_algorithm_select)
 
-        run_button = Button(
-            text='Run',
-            size_hint=(1, None),
-            height=44
-        )
-        run_button.bind(on_press=self.run_algorithm)
-
         self.console_output = TextInput(
             readonly=True,
             size_hint=(1, 0.3),
@@ -290,35 +442,26 @@ class MainScreen(Screen):
 
         side_menu.add_widget(self.grid_selector)
         side_menu.add_widget(algorithm_spinner)
-        side_menu.add_widget(run_button)
+        self.build_run_controls(side_menu)
         side_menu.add_widget(self.console_output)
         side_menu.add_widget(save_log_button)
         side_menu.add_widget(back_button)
 
-        sys.stdout = TextOutput(self.console_output)
-        sys.stderr = TextOutput(self.console_output)
-        main_layout.add_widget(self.grid_layout)
+        # One buffer for both streams, so their lines interleave in order
+        self.console = TextOutput(self.console_output)
+        sys.stdout = sys.stderr = self.console
+        main_layout.add_widget(self.grid_view)
         main_layout.add_widget(side_menu)
 
         self.add_widget(main_layout)
 
-        Window.bind(on_resize=self.on_window_resize)
-
-    def on_touch_down(self, touch):
-        if self.grid_layout.collide_point(*touch.pos):
-            # Touch is within the grid, disable left and right clicks
-            if touch.button == 'left' or touch.button == 'right':
-                return True  # Consume the touch event
-        return super(MainScreen, self).on_touch_down(touch)
-
     def go_to_intro(self, instance):
+        self.cancel_search()
         self.manager.transition.direction = 'right'
         self.manager.current = 'intro'
 
-    def on_window_resize(self, instance, width, height):
-        self.clear_path()
-
     def on_grid_select(self, spinner, text):
+        self.cancel_search()
         self.clear_path()
         self.setup_grid(text)
 
@@ -326,58 +469,12 @@ class MainScreen(Screen):
         grid_info = self.predefined_grids[grid_name]
         self.start_point = grid_info['start']
         self.goal_point = grid_info['goal']
-        grid_array = grid_info['grid']
-
-        for y in range(10): #Grid size
-            for x in range(10):
-                cell = self.grid_layout.children[-(y * 10 + x + 1)]
-                cell.reset_state()
-                if grid_array[y][x] == 1:
-                    cell.toggle_state()
-                if (x, y) == self.start_point:
-                    cell.set_start()
-                if (x, y) == self.goal_point:
-                    cell.set_goal()
-
-    def get_grid_state(self):
-        return get_grid_state(self.grid_layout)
-
-    def clear_path(self, *args):
-        self.grid_layout.canvas.after.clear()
-
-    def display_path(self, path):
-        self.path_index = 0
-        self.path = path
-        Clock.schedule_interval(self.animate_path, 1 / 30)  # FPS
-
-    def animate_path(self, dt):
-        if self.path_index < len(self.path):
-            x, y = self.path[self.path_index]
-            cell = self.grid_layout.children[-(y * 10 + x + 1)] #Grid size
-            with self.grid_layout.canvas.after:
-                Color(0, 0, 1, mode='rgba')
-                d = min(cell.width, cell.height) / 4
-                Ellipse(pos=(cell.center_x - d / 2, cell.center_y - d / 2), size=(d, d))
-                if self.path_index > 0:
-                    prev_x, prev_y = self.path[self.path_index - 1]
-                    prev_cell = self.grid_layout.children[-(prev_y * 10 + prev_x + 1)] #Grid size
-                    Line(points=[prev_cell.center_x, prev_cell.center_y, cell.center_x, cell.center_y], width=1.5)
-            self.path_index += 1
-        else:
-            Clock.unschedule(self.animate_path)
-
-    def show_popup(self, title, message):
-        popup = Popup(title=title, content=Label(text=message), size_hint=(None, None), size=(400, 200))
-        popup.open()
-
-    def on_algorithm_select(self, spinner, text):
-        self.clear_path()
-        self.selected_algorithm = text
+        self.grid_view.set_grid(grid_info['grid'], self.start_point, self.goal_point)
 
     def run_algorithm(self, instance):
+        self.cancel_search()
         self.clear_console()  # Clear the console before running the algorithm
         self.clear_path()
-        Clock.unschedule(self.animate_path)
 
         if not hasattr(self, 'selected_algorithm') or self.selected_algorithm is None:
             self.show_popup("Whoops", "Please select an algorithm first.")
@@ -387,103 +484,40 @@ class MainScreen(Screen):
             self.show_popup("Whoops", "Please select a grid first.")
             return
 
-        try:
-            grid_state = self.get_grid_state()
-            start_point = self.start_point
-            goal_point = self.goal_point
-
-            if not (0 <= start_point[0] < len(grid_state) and 0 <= start_point[1] < len(grid_state[0]) and
-                    0 <= goal_point[0] < len(grid_state) and 0 <= goal_point[1] < len(grid_state[0])):
-                print("Start or goal coordinates are out of grid bounds.")
-                return
-
-            if self.selected_algorithm == 'A*':
-                path, explored_nodes, execution_time = astar(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Branch and Bound':
-                path, explored_nodes, execution_time = branch_and_bound(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Dijkstra':
-                path, explored_nodes, execution_time = dijkstra(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Greedy Best First Search':
-                path, explored_nodes, execution_time = greedy_best_first_search(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Hierarchical Pathfinding A*':
-                path, explored_nodes, execution_time = hierarchical_pathfinding(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Jump Point Search':
-                path, explored_nodes, execution_time = jump_point_search(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Dynamic A*':
-                path, explored_nodes, execution_time = dynamic_astar(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Theta*':
-                path, explored_nodes, execution_time = theta_star(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Breadth-First Search (BFS)':
-                path, explored_nodes, execution_time = bfs(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Depth-First Search (DFS)':
-                path, explored_nodes, execution_time = dfs(start_point, goal_point, grid_state)
-            elif self.selected_algorithm == 'Swarm Algorithm':
-                path, explored_nodes, execution_time = swarm_algorithm(start_point, goal_point, grid_state)
-            else:
-                print("Unknown algorithm selected.")
-                return
-
-            if path:
-                print(f"Path found: {path}")
-                print(f"Nodes explored: {len(explored_nodes)}")
-                print(f"Execution time: {execution_time:.10f} seconds")
-                self.display_explored_nodes(explored_nodes)  # Display explored nodes
-                self.display_path(path)
-            else:
-                print("No path found.")
-        except Exception as e:
-            print(f"Error running algorithm: {e}")
-            import traceback
-            traceback.print_exc()
-            self.show_popup("Error", f"An error occurred while running the algorithm:\n{e}")
+        grid_state = self.grid_view.grid
+        start_point = self.start_point
+        goal_point = self.goal_point
 
-    def display_explored_nodes(self, explored_nodes):
-        for node in explored_nodes:
-            x, y = node
-            cell = self.grid_layout.children[-(y * 10 + x + 1)] #Grid size
-            with self.grid_layout.canvas.after:
-                Color(1, 1, 0, mode='rgba')  # Yellow for explored nodes
-                d = min(cell.width, cell.height) / 2
-                Ellipse(pos=(cell.center_x - d / 2, cell.center_y - d / 2), size=(d, d))
+        if not (grid_state.in_bounds(start_point) and grid_state.in_bounds(goal_point)):
+            print("Start or goal coordinates are out of grid bounds.")
+            return
+
+        if self.selected_algorithm not in REGISTRY:
+            print("Unknown algorithm selected.")
+            return
+
+        algorithm = self.selected_algorithm
+        self.start_search(self.grid_selector.text, algorithm,
+                          self.solve_cached(algorithm, start_point, goal_point, grid_state), start_point, goal_point)
 
     def save_console_output(self, instance):
         try:
-            # Define the directory for console logs
-            log_dir = 'Console Logs'
-            
-            # Create the directory if it does not exist
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-
-            # Generate the filename and full path
-            scenario_name = self.grid_selector.text.replace(' ', '_')
-            algorithm_name = re.sub(r'[<>:"/\\|?*]', '_', self.selected_algorithm.replace(' ', '_'))
-            filename = f"{scenario_name}_{algorithm_name}.txt"
-            file_path = os.path.join(log_dir, filename)
-            
-            # Save the console output to the specified file
-            with open(file_path, 'w') as f:
-                f.write(self.console_output.text)
-            print(f"Console output saved to {file_path}")
+            self.save_logs(log_name(self.grid_selector.text, self.selected_algorithm))
         except Exception as e:
             print(f"Error saving console output: {e}")
 
-    def clear_console(self):
-        self.console_output.text = ''
-
-class ManualGridScreen(Screen):
+class ManualGridScreen(SearchScreen):
     def __init__(self, **kwargs):
         super(ManualGridScreen, self).__init__(**kwargs)
 
         self.mode = 'start'  # Initialize mode
 
-        self.grid_layout = GridLayout(cols=10, rows=10, size_hint=(.7, 1))
-
-        for y in range(10):
-            for x in range(10):
-                cell = Cell()
-                cell.position = (x, y)
-                self.grid_layout.add_widget(cell)
+        self.grid_view = GridView(OccupancyGrid.empty(*MANUAL_GRID_SIZE), size_hint=(.7, 1))
+        self.grid_view.bind(on_cell_press=self.on_manual_cell_press)
+        # The editor owns the map; edits redraw only their own cell
+        self.editor = GridEditor(self.grid_view.grid, on_change=self.grid_view.refresh_cell)
+        # D* Lite planner kept between runs of an incremental algorithm
+        self.planner = None
 
         side_menu = BoxLayout(orientation='vertical', size_hint=(.3, 1))
 
@@ -505,19 +539,12 @@ class ManualGridScreen(Screen):
 
         algorithm_spinner = Spinner(
             text='Select Algorithm',
-            values=('A*', 'Branch and Bound', 'Dijkstra', 'Greedy Best First Search', 'Hierarchical Pathfinding A*', 'Jump Point Search', 'Dynamic A*', 'Theta*', 'Breadth-First Search (BFS)', 'Depth-First Search (DFS)', 'Swarm Algorithm'),
+            values=tuple(REGISTRY),
             size_hint=(1, None),
             height=44
         )
         algorithm_spinner.bind(text=self.on_algorithm_select)
 
-        run_button = Button(
-            text='Run',
-            size_hint=(1, None),
-            height=44
-        )
-        run_button.bind(on_press=self.run_algorithm)
-
         self.console_output = TextInput(
             readonly=True,
             size_hint=(1, 0.3),
@@ -541,29 +568,31 @@ class ManualGridScreen(Screen):
         back_button.bind(on_press=self.go_to_intro)
 
         side_menu.add_widget(algorithm_spinner)
-        side_menu.add_widget(run_button)
+        self.build_run_controls(side_menu)
         side_menu.add_widget(self.console_output)
         side_menu.add_widget(save_log_button)
         side_menu.add_widget(back_button)
 
-        sys.stdout = TextOutput(self.console_output)
-        sys.stderr = TextOutput(self.console_output)
+        # One buffer for both streams, so their lines interleave in order
+        self.console = TextOutput(self.console_output)
+        sys.stdout = sys.stderr = self.console
         main_layout = BoxLayout(orientation='horizontal')
-        main_layout.add_widget(self.grid_layout)
+        main_layout.add_widget(self.grid_view)
         main_layout.add_widget(side_menu)
 
         self.add_widget(main_layout)
 
-        Window.bind(on_resize=self.on_window_resize)
-
     def set_mode(self, mode):
         self.mode = mode
 
     def reset_grid(self, instance):
-        for cell in self.grid_layout.children:
-            cell.reset_state()
+        self.cancel_search()
+        self.clear_path()
+        self.editor.clear()
+        self.grid_view.set_endpoints(None, None)
 
     def go_to_intro(self, instance):
+        self.cancel_search()
         self.manager.transition.direction = 'right'
         self.manager.current = 'intro'
         Clock.schedule_once(self.remove_self, 0.1)
@@ -571,49 +600,95 @@ class ManualGridScreen(Screen):
     def remove_self(self, dt):
         self.manager.remove_widget(self)
 
-    def on_window_resize(self, instance, width, height):
-        self.grid_layout.canvas.after.clear()
-
-    def on_algorithm_select(self, spinner, text):
-        self.clear_path()
-        self.selected_algorithm = text
-
-    def on_manual_cell_press(self, cell):
+    def cancel_search(self, *args):
+        if self.search is not None and REGISTRY[self.selected_algorithm].incremental:
+            # A cancelled repair leaves the planner half updated
+            self.planner = None
+        super(ManualGridScreen, self).cancel_search(*args)
+
+    def on_manual_cell_press(self, grid_view, node):
+        # An edit makes a running search stale; cancelling also waits for it
+        # to stop reading the grid before the edit changes it
+        self.cancel_search()
+        editor = self.editor
         if self.mode == 'start':
-            for c in self.grid_layout.children:
-                if c.is_start:
-                    c.reset_state()
-            cell.set_start()
+            editor.set_cell(node, False)
+            editor.start, editor.goal = node, None if editor.goal == node else editor.goal
         elif self.mode == 'goal':
-            for c in self.grid_layout.children:
-                if c.is_goal:
-                    c.reset_state()
-            cell.set_goal()
+            editor.set_cell(node, False)
+            editor.start, editor.goal = None if editor.start == node else editor.start, node
         elif self.mode == 'obstacle':
-            cell.toggle_state()
+            if node in (editor.start, editor.goal):
+                # Like an obstacle click on any marked cell, this just clears it
+                editor.start = None if editor.start == node else editor.start
+                editor.goal = None if editor.goal == node else editor.goal
+            else:
+                editor.set_cell(node, editor.grid.is_free(node))
+        grid_view.set_endpoints(editor.start, editor.goal)
 
     def run_algorithm(self, instance):
-        # Implement the algorithm running logic here
-        pass
+        self.cancel_search()
+        self.clear_console()  # Clear the console before running the algorithm
+        self.clear_path()
 
-    def display_explored_nodes(self, explored_nodes):
-        for node in explored_nodes:
-            x, y = node
-            cell = self.grid_layout.children[-(y * 10 + x + 1)]
-            with self.grid_layout.canvas.after:
-                Color(1, 1, 0, mode='rgba')  # Yellow for explored nodes
-                d = min(cell.width, cell.height) / 2
-                Ellipse(pos=(cell.center_x - d / 2, cell.center_y - d / 2), size=(d, d))
+        if not hasattr(self, 'selected_algorithm') or self.selected_algorithm not in REGISTRY:
+            self.show_popup("Whoops", "Please select an algorithm first.")
+            return
 
-    def save_console_output(self, instance):
-        # Implement the logic to save console output here
-        pass
+        editor = self.editor
+        if editor.start is None or editor.goal is None:
+            self.show_popup("Whoops", "Please place a start and a goal first.")
+            return
 
-    def clear_console(self):
-        self.console_output.text = ''
+        algorithm = self.selected_algorithm
+        if self.planner is not None and self.planner.goal != editor.grid.index(editor.goal):
+            # The kept search runs back from the old goal and cannot be reused
+            self.planner = None
+        if self.planner is not None and REGISTRY[algorithm].incremental:
+            # Like D* Lite itself, move the start before scanning the edits
+            self.planner.move_start(editor.start)
+
+        # Bring the cache and planner up to date with the edits since the last run
+        changes = editor.sync(self.path_cache, [self.planner] if self.planner is not None else [])
+        if changes:
+            print(f"Applied {len(changes)} cell edit(s) since the last run.")
+
+        if REGISTRY[algorithm].incremental:
+            solve = self.solve_incremental(algorithm, editor.start, editor.goal)
+        else:
+            solve = self.solve_cached(algorithm, editor.start, editor.goal, editor.grid)
+        self.start_search('Manual Grid', algorithm, solve, editor.start, editor.goal)
+
+    def solve_incremental(self, algorithm, start_point, goal_point):
+        """Replan with the kept D* Lite planner, which repairs only what the edits changed."""
+        grid = self.editor.grid
+        if self.planner is None:
+            self.planner = DStarLite(grid, start_point, goal_point)
+        planner = self.planner
+
+        def solve(sink):
+            tracer = Tracer(algorithm, TRACE_FULL, sink)
+            planner.tracer = tracer
+            start_time = time.perf_counter()
+            try:
+                path = planner.replan()
+            except Exception:
+                self.planner = None
+                raise
+            finally:
+                # Edits pushed before the next run must not trace into this one
+                planner.tracer = None
+            explored_nodes = {grid.coords(node) for node in planner.expanded}
+            execution_time = time.perf_counter() - start_time
+            tracer.summary(path, explored_nodes, execution_time)
+            return (path, explored_nodes, execution_time), False
+        return solve
 
-    def clear_path(self):
-        self.grid_layout.canvas.after.clear()
+    def save_console_output(self, instance):
+        if hasattr(self, 'selected_algorithm'):
+            self.save_logs(log_name('Manual Grid', self.selected_algorithm))
+        else:
+            self.save_logs(log_name('Manual Grid'))
 
 
 class PathfindingVisualizerApp(App):
@@ -633,9 +708,5 @@ class PathfindingVisualizerApp(App):
 
         return sm
 
-    def on_manual_cell_press(self, cell):
-        screen = self.root.get_screen('manual_grid')
-        screen.on_manual_cell_press(cell)
-
 if __name__ == "__main__":
     PathfindingVisualizerApp().run()
@@ -0,0 +1,165 @@
+import json
+import os
+
+import numpy as np
+
+from algorithms import REGISTRY, path_cost
+from grid import OccupancyGrid
+import map_format
+
+# Characters treated as blocked when reading a plain text map
+TEXT_BLOCKED = set('1#@TOW')
+
+
+def load_costs(path):
+    """Load a cost layer from a ``.npy`` array or whitespace separated integers."""
+    if os.path.splitext(path)[1] == '.npy':
+        return np.load(path)
+    return np.loadtxt(path, dtype=np.int64, ndmin=2)
+
+
+def load_map(path, costs=None):
+    """Load an occupancy grid from a map file.
+
+    Binary ``.pfmap`` files (see map_format.py) are memory-mapped, MovingAI
+    ``.map`` files and ``.npy`` arrays are read in full. Other text maps
+    have one row per line, either as whitespace separated 0/1 values or as
+    one character per cell where any of ``1#@TOW`` is an obstacle and
+    everything else is free. ``costs`` optionally names a cost layer file
+    for ``load_costs``, replacing any the map has.
+    """
+    if costs is not None:
+        costs = load_costs(costs)
+    extension = os.path.splitext(path)[1]
+    if extension == map_format.EXTENSION or map_format.is_movingai(path):
+        grid = map_format.load_map_file(path)
+        return grid if costs is None else OccupancyGrid.from_array(grid.to_array(), costs)
+    if extension == '.npy':
+        return OccupancyGrid.from_array(np.load(path), costs)
+
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            values = line.split()
+            if len(values) > 1:
+                rows.append([int(value) for value in values])
+            else:
+                rows.append([1 if char in TEXT_BLOCKED else 0 for char in line])
+    if len({len(row) for row in rows}) > 1:
+        raise ValueError(f"Rows in {path} are not all the same length")
+    return OccupancyGrid.from_array(np.array(rows, dtype=np.uint8), costs)
+
+
+def load_scenario(name):
+    from constants import predefined_grids
+    info = predefined_grids[name]
+    return info['grid'], info['start'], info['goal']
+
+
+def _point(query, key):
+    value = query[key]
+    if (not isinstance(value, list) or len(value) != 2
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{key!r} must be a list of two integers, got {value!r}")
+    return tuple(value)
+
+
+def parse_query(line, number, default_algorithm):
+    """Turn one JSON line into a query, or an error query naming what is wrong with it."""
+    try:
+        query = json.loads(line)
+    except json.JSONDecodeError as error:
+        return {'id': number, 'error': f"Invalid JSON on query line: {error}"}
+    if not isinstance(query, dict):
+        return {'id': number, 'error': "A query must be a JSON object"}
+    query_id = query.get('id', number)
+    try:
+        algorithm = query.get('algorithm', default_algorithm)
+        if not isinstance(algorithm, str):
+            raise ValueError(f"'algorithm' must be a name, got {algorithm!r}")
+        return {
+            'id': query_id,
+            'start': _point(query, 'start'),
+            'goal': _point(query, 'goal'),
+            'algorithm': algorithm,
+        }
+    except KeyError as error:
+        return {'id': query_id, 'error': f"Query is missing {error.args[0]!r}"}
+    except ValueError as error:
+        return {'id': query_id, 'error': str(error)}
+
+
+def read_queries(lines, default_algorithm):
+    """Parse JSON lines of ``{"start": [x, y], "goal": [x, y]}`` queries.
+
+    Each query may also carry an ``id`` and an ``algorithm`` name; queries
+    without an id are numbered by their position in the stream. A line
+    that is not a valid query becomes a query with an ``error``, which
+    ``solve`` reports instead of stopping the batch.
+    """
+    number = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        yield parse_query(line, number, default_algorithm)
+        number += 1
+
+
+def solve(grid, query, include_path=True, cache=None, landmarks=None):
+    """Run one query against ``grid`` and return a JSON-ready result record.
+
+    With a ``PathCache`` repeated queries are answered from the cache.
+    ``landmarks``, an ALT heuristic, is passed to every optimal search that
+    takes a heuristic.
+    """
+    if 'error' in query:
+        return {'id': query['id'], 'error': query['error']}
+    result = {
+        'id': query['id'],
+        'algorithm': query['algorithm'],
+        'start': list(query['start']),
+        'goal': list(query['goal']),
+    }
+    info = REGISTRY.get(query['algorithm'])
+    if info is None:
+        result['error'] = f"Unknown algorithm {query['algorithm']!r}"
+        return result
+    if not (grid.in_bounds(query['start']) and grid.in_bounds(query['goal'])):
+        result['error'] = "Start or goal coordinates are out of grid bounds."
+        return result
+
+    options = {'heuristic': landmarks} if landmarks is not None and info.heuristic and info.optimal else {}
+    try:
+        if cache is not None:
+            hits = cache.hits
+            path, explored_nodes, execution_time = cache.solve(query['algorithm'], query['start'], query['goal'],
+                                                               grid, **options)
+            result['cached'] = cache.hits > hits
+        else:
+            path, explored_nodes, execution_time = info.function(query['start'], query['goal'], grid, **options)
+    except ValueError as error:
+        # e.g. a search that cannot run on grids with a cost layer
+        result['error'] = str(error)
+        return result
+    result['found'] = bool(path)
+    result['cost'] = path_cost(path, grid) if path else None
+    result['length'] = len(path)
+    result['nodes_explored'] = len(explored_nodes)
+    result['execution_time'] = execution_time
+    if include_path:
+        result['path'] = [list(node) for node in path]
+    return result
+
+
+def run_batch(grid, queries, include_path=True, cache=None, landmarks=None):
+    for query in queries:
+        yield solve(grid, query, include_path, cache, landmarks)
+
+
+def write_results(results, stream):
+    for result in results:
+        stream.write(json.dumps(result) + "\n")
@@ -0,0 +1,243 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms import REGISTRY, path_cost
+from grid import OccupancyGrid
+import distance_field
+import grid_generators
+import hpa
+import jump_tables
+import landmarks
+
+DEFAULT_SIZES = (10, 50, 100, 250)
+DEFAULT_DENSITIES = (0.1, 0.25, 0.35)
+# Per-map precomputation kept between searches
+PRECOMPUTE_CACHES = (hpa.cache, jump_tables.cache, distance_field.cache, landmarks.cache)
+
+# Run in a fresh interpreter, so imports are timed cold: what the app does
+# with the scenario catalog before its first frame, then the first
+# scenario being selected
+STARTUP_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+from constants import predefined_grids
+names = list(predefined_grids)
+listed = time.perf_counter()
+predefined_grids[names[0]]
+print(json.dumps([listed - started, time.perf_counter() - listed]))
+'''
+
+
+def benchmark_maps(sizes, kinds, densities, seed):
+    """Yield ``(name, kind, size, density, array, start, goal)`` for each map.
+
+    Obstacle density only applies to random maps; the other generators get
+    one map per size.
+    """
+    for size in sizes:
+        for kind in kinds:
+            for density in (densities if kind == 'random' else (None,)):
+                array = grid_generators.generate(kind, size, size, density or 0.0, seed)
+                start, goal = grid_generators.corner_endpoints(array)
+                name = f"{kind}-{size}" + (f"-{density:g}" if density is not None else "")
+                yield name, kind, size, density, array, start, goal
+
+
+def clear_caches():
+    for cache in PRECOMPUTE_CACHES:
+        cache.clear()
+
+
+def measure(algorithm, start, goal, grid, repeat=1, memory=True):
+    """Time ``algorithm`` and, optionally, its peak traced allocation.
+
+    The first run starts with the precomputation caches cleared, so HPA*,
+    JPS+ and Flow Field build their tables in it. Wall time is the best of
+    ``repeat`` further untraced runs that reuse them, i.e. the query time
+    alone, and build time is what the first run took on top of that, so
+    both compare the same work whatever ``repeat`` is. Peak memory comes
+    from one extra run under tracemalloc, which is kept apart because the
+    tracing itself slows allocation-heavy searches down.
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+    clear_caches()
+    started = time.perf_counter()
+    algorithm(start, goal, grid)
+    cold = time.perf_counter() - started
+
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        path, explored_nodes, _ = algorithm(start, goal, grid)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            algorithm(start, goal, grid)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'wall_time': best,
+        'build_time': max(cold - best, 0.0),
+        'nodes_expanded': len(explored_nodes),
+        'peak_memory': peak,
+        'found': bool(path),
+        'path_length': len(path),
+        'path_cost': path_cost(path, grid) if path else None,
+    }
+
+
+def measure_startup(repeat=1):
+    """Time loading the scenario catalog and its first scenario.
+
+    Returns records shaped like the search ones, under the map name
+    ``startup``, so ``compare`` flags startup regressions as well.
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        times = json.loads(output)
+        best = times if best is None else [min(old, new) for old, new in zip(best, times)]
+    return [
+        {'map': 'startup', 'kind': 'startup', 'size': None, 'density': None, 'algorithm': step,
+         'wall_time': elapsed, 'build_time': None, 'nodes_expanded': 0, 'peak_memory': None, 'found': False,
+         'path_length': 0, 'path_cost': None}
+        for step, elapsed in zip(('list scenarios', 'first scenario'), best)
+    ]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, kinds=grid_generators.GRID_KINDS, densities=DEFAULT_DENSITIES,
+                   algorithms=None, seed=0, repeat=1, memory=True, progress=None, weighted=False, startup=True):
+    """Measure every algorithm on every generated map.
+
+    With ``weighted`` each map also gets a seeded terrain cost layer, so the
+    cost lookups in the search loops are part of the timing; algorithms
+    that do not support costs are left out. With ``startup`` the results
+    begin with the ``measure_startup`` records.
+    """
+    names = list(algorithms or REGISTRY)
+    if weighted:
+        names = [name for name in names if REGISTRY[name].weighted]
+    results = []
+    if startup:
+        for record in measure_startup(repeat):
+            results.append(record)
+            if progress is not None:
+                progress(record)
+    for map_name, kind, size, density, array, start, goal in benchmark_maps(sizes, kinds, densities, seed):
+        costs = grid_generators.terrain_costs(size, size, seed=seed) if weighted else None
+        grid = OccupancyGrid.from_array(array, costs)
+        if weighted:
+            map_name += "-weighted"
+        for name in names:
+            record = {
+                'map': map_name,
+                'kind': kind,
+                'size': size,
+                'density': density,
+                'algorithm': name,
+            }
+            record.update(measure(REGISTRY[name].function, start, goal, grid, repeat, memory))
+            results.append(record)
+            if progress is not None:
+                progress(record)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save_results(results, path, seed):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'seed': seed, 'results': results}, f, indent=1)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(baseline, current, threshold=1.2):
+    """Pair runs by map and algorithm and flag slowdowns above ``threshold``.
+
+    Returns ``(rows, regressions)`` where each row is ``(map, algorithm,
+    old_time, new_time, ratio)``. A changed path cost is also counted as a
+    regression, whatever the timing.
+    """
+    old = {(r['map'], r['algorithm']): r for r in baseline}
+    rows = []
+    regressions = []
+    for record in current:
+        key = (record['map'], record['algorithm'])
+        if key not in old:
+            continue
+        before = old[key]
+        ratio = record['wall_time'] / before['wall_time'] if before['wall_time'] else float('inf')
+        row = (key[0], key[1], before['wall_time'], record['wall_time'], ratio)
+        rows.append(row)
+        if ratio > threshold or record['path_cost'] != before['path_cost']:
+            regressions.append(row)
+    return rows, regressions
+
+
+def bidirectional_savings(results):
+    """Compare each bidirectional run with its one-directional counterpart.
+
+    Returns rows of ``(map, algorithm, counterpart_nodes, nodes, saving)``
+    where ``saving`` is the fraction of expanded nodes avoided.
+    """
+    runs = {(r['map'], r['algorithm']): r for r in results}
+    rows = []
+    for record in results:
+        info = REGISTRY.get(record['algorithm'])
+        before = info and runs.get((record['map'], info.counterpart))
+        if before is None:
+            continue
+        saving = 1 - record['nodes_expanded'] / before['nodes_expanded'] if before['nodes_expanded'] else 0.0
+        rows.append((record['map'], record['algorithm'], before['nodes_expanded'], record['nodes_expanded'], saving))
+    return rows
+
+
+def print_savings(rows, stream=sys.stdout):
+    for map_name, algorithm, before, after, saving in rows:
+        stream.write(f"{map_name:<24} {algorithm:<28} {before:>9} -> {after:>9} nodes  {saving:.0%} saved\n")
+
+
+def format_record(record):
+    memory = f"{record['peak_memory'] / 1024:10.1f} KiB" if record['peak_memory'] is not None else " " * 14
+    cost = f"{record['path_cost']:.2f}" if record['found'] else '-'
+    # Baselines saved before build times were recorded have none
+    build = f"  build {record['build_time'] * 1000:.3f} ms" if record.get('build_time') is not None else ''
+    return (f"{record['map']:<24} {record['algorithm']:<28} {record['wall_time'] * 1000:10.3f} ms "
+            f"{record['nodes_expanded']:>9} nodes {memory}  cost {cost}{build}")
+
+
+def print_comparison(rows, stream=sys.stdout):
+    for map_name, algorithm, before, after, ratio in rows:
+        stream.write(f"{map_name:<24} {algorithm:<28} {before * 1000:10.3f} -> {after * 1000:10.3f} ms  x{ratio:.2f}\n")
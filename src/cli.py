@@ -0,0 +1,153 @@
+import argparse
+import json
+import sys
+
+from algorithms import REGISTRY
+import batch
+import benchmark
+import grid_generators
+from grid import OccupancyGrid
+from landmarks import get_landmarks
+import map_format
+from path_cache import DEFAULT_MAX_ENTRIES, PathCache
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='pathfinder', description="Headless pathfinding tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = commands.add_parser('batch', help="Solve start/goal queries and write JSON lines.")
+    source = batch_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('map', nargs='?', help="Map file (.pfmap, MovingAI .map, .npy or text grid).")
+    source.add_argument('--scenario', help="Use one of the predefined scenarios instead of a map file.")
+    batch_parser.add_argument('--costs', help="Cost layer file (.npy or whitespace separated integers, 1-65535).")
+    batch_parser.add_argument('-q', '--queries',
+                              help="JSON lines query file, or - for stdin. Defaults to stdin for map files "
+                                   "and to the scenario's own start and goal for --scenario.")
+    batch_parser.add_argument('-o', '--output', help="Result file (default: stdout).")
+    batch_parser.add_argument('-a', '--algorithm', default='A*', choices=list(REGISTRY),
+                              help="Algorithm for queries that do not name one.")
+    batch_parser.add_argument('--no-paths', action='store_true', help="Leave paths out of the results.")
+    batch_parser.add_argument('-j', '--workers', type=int, default=1,
+                              help="Worker processes to spread queries over; 0 uses every core (default: 1).")
+    batch_parser.add_argument('--unordered', action='store_true',
+                              help="With several workers, write results as they finish instead of in input order.")
+    batch_parser.add_argument('--landmarks', type=int, metavar='K',
+                              help="Guide the optimal searches with K ALT landmarks; the tables are saved next "
+                                   "to the map and memory-mapped on later runs.")
+    batch_parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_ENTRIES,
+                              help="Results kept for repeated queries, per worker; 0 disables the cache "
+                                   f"(default: {DEFAULT_MAX_ENTRIES}).")
+    batch_parser.set_defaults(handler=run_batch_command)
+
+    bench_parser = commands.add_parser('bench', help="Benchmark the algorithms on generated maps.")
+    bench_parser.add_argument('--sizes', type=int, nargs='+', default=list(benchmark.DEFAULT_SIZES),
+                              help="Square map sizes to generate (up to 2000).")
+    bench_parser.add_argument('--kinds', nargs='+', default=list(grid_generators.GRID_KINDS),
+                              choices=grid_generators.GRID_KINDS, help="Map generators to use.")
+    bench_parser.add_argument('--densities', type=float, nargs='+', default=list(benchmark.DEFAULT_DENSITIES),
+                              help="Obstacle densities for random maps.")
+    bench_parser.add_argument('-a', '--algorithms', nargs='+', choices=list(REGISTRY),
+                              help="Algorithms to run (default: all).")
+    bench_parser.add_argument('--seed', type=int, default=0, help="Seed for the map generators.")
+    bench_parser.add_argument('--weighted', action='store_true',
+                              help="Give every map a terrain cost layer (only algorithms that support costs run).")
+    bench_parser.add_argument('--repeat', type=positive_int, default=1,
+                              help="Timed runs per case after the cold first run; the best is kept.")
+    bench_parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak memory run.")
+    bench_parser.add_argument('--no-startup', action='store_true',
+                              help="Skip timing the scenario catalog startup in a fresh interpreter.")
+    bench_parser.add_argument('-o', '--output', help="Write results to this JSON file.")
+    bench_parser.add_argument('--compare', help="Baseline JSON file from an earlier run to compare against.")
+    bench_parser.add_argument('--threshold', type=float, default=1.2,
+                              help="Slowdown ratio reported as a regression (default: 1.2).")
+    bench_parser.set_defaults(handler=run_bench_command)
+
+    convert_parser = commands.add_parser('convert', help="Convert a map to the binary map format.")
+    convert_parser.add_argument('map', help="Map file in any format the batch command reads.")
+    convert_parser.add_argument('output', help=f"Binary map file to write (conventionally {map_format.EXTENSION}).")
+    convert_parser.add_argument('--costs', help="Cost layer file to store with the map.")
+    convert_parser.set_defaults(handler=run_convert_command)
+
+    return parser
+
+
+def run_batch_command(args):
+    if args.scenario:
+        grid, start, goal = batch.load_scenario(args.scenario)
+        if args.costs:
+            grid = OccupancyGrid.from_array(grid.to_array(), batch.load_costs(args.costs))
+    else:
+        grid = batch.load_map(args.map, args.costs)
+
+    tables = None
+    if args.landmarks:
+        tables = get_landmarks(grid, args.landmarks, None if args.scenario else args.map)
+
+    from_file = args.queries not in (None, '-')
+    if args.scenario and args.queries is None:
+        lines = [json.dumps({'start': start, 'goal': goal})]
+    elif from_file:
+        lines = open(args.queries)
+    else:
+        lines = sys.stdin
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        queries = batch.read_queries(lines, args.algorithm)
+        if args.workers == 1:
+            cache = PathCache(args.cache_size) if args.cache_size else None
+            results = batch.run_batch(grid, queries, not args.no_paths, cache,
+                                      tables.heuristic if tables else None)
+        else:
+            from parallel import run_batch_parallel
+            results = run_batch_parallel(grid, queries, workers=args.workers or None,
+                                         ordered=not args.unordered, include_path=not args.no_paths,
+                                         cache_size=args.cache_size, landmarks=tables)
+        batch.write_results(results, output)
+    finally:
+        if from_file:
+            lines.close()
+        if args.output:
+            output.close()
+    return 0
+
+
+def run_bench_command(args):
+    results = benchmark.run_benchmarks(args.sizes, args.kinds, args.densities, args.algorithms, args.seed,
+                                       args.repeat, not args.no_memory,
+                                       progress=lambda record: print(benchmark.format_record(record), flush=True),
+                                       weighted=args.weighted, startup=not args.no_startup)
+    savings = benchmark.bidirectional_savings(results)
+    if savings:
+        print()
+        benchmark.print_savings(savings)
+    if args.output:
+        benchmark.save_results(results, args.output, args.seed)
+    if args.compare:
+        rows, regressions = benchmark.compare(benchmark.load_results(args.compare), results, args.threshold)
+        print()
+        benchmark.print_comparison(rows)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}")
+            return 1
+    return 0
+
+
+def run_convert_command(args):
+    grid = batch.load_map(args.map, args.costs)
+    map_format.write_map(args.output, grid)
+    print(f"Wrote {args.output}: {grid.width}x{grid.height}{' with costs' if grid.weighted else ''}")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
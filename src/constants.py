@@ -1,69 +1,5 @@
-import numpy as np
+from map_format import ScenarioCatalog
 
-predefined_grids = {
-    'Scenario 1': {'start': (0, 0), 'goal': (9, 9),
-                   'grid': np.array([
-                       [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 1, 0, 0, 1, 0, 0],
-                       [0, 1, 0, 1, 0, 0, 0, 1, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [0, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 1, 1, 1, 1, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [1, 1, 0, 0, 1, 0, 0, 0, 1, 0],
-                       [0, 0, 0, 1, 0, 0, 0, 1, 0, 0]
-                   ])},
-    'Scenario 2': {'start': (0, 1), 'goal': (9, 9),
-                   'grid': np.array([
-                       [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 1, 0, 0, 1, 0, 0],
-                       [0, 1, 0, 1, 0, 0, 0, 1, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [0, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 1, 1, 1, 1, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [1, 1, 0, 0, 1, 0, 0, 0, 1, 0],
-                       [0, 0, 0, 1, 0, 0, 0, 1, 0, 0]
-                   ])},
-    'Scenario 3': {'start': (0, 0), 'goal': (9, 9),
-                   'grid': np.array([
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 1, 0, 1, 1, 0, 1, 1, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [0, 1, 1, 0, 1, 1, 0, 1, 1, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 1, 0, 1, 1, 0, 1, 1, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 1, 0],
-                       [0, 1, 1, 0, 1, 1, 0, 1, 1, 0],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-                   ])},
-    'Scenario 4': {'start': (0, 1), 'goal': (9, 9),
-                   'grid': np.array([
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 1, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 0, 1, 1, 1, 0, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 1, 0, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 0, 0, 0, 1, 1, 1, 0, 0],
-                       [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-                       [0, 1, 1, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-                   ])},
-    'Scenario 5': {'start': (0, 0), 'goal': (9, 9),
-                   'grid': np.array([
-                       [0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
-                       [0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
-                       [0, 1, 0, 0, 0, 1, 0, 0, 0, 1],
-                       [0, 0, 0, 1, 0, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 1, 1],
-                       [0, 0, 0, 1, 1, 0, 0, 0, 1, 1]
-                   ])},
-}
+# The scenarios listed in maps/index.json; each map is read the first time
+# its scenario is selected
+predefined_grids = ScenarioCatalog()
@@ -0,0 +1,150 @@
+import numpy as np
+
+from grid import DIRECTIONS_8, FREE, STEP_LENGTHS_8, GridCache
+
+UNREACHABLE = np.inf
+
+# Width of the cost range expanded per sweep; one straight step, so each
+# sweep is about one ring of the wavefront on a uniform grid
+STEP_BUCKET = 1.0
+
+# Fields for the most recently used goals, keyed by (grid fingerprint, goal)
+CACHE_SIZE = 16
+cache = GridCache(CACHE_SIZE)
+
+
+def compute_distances(grid, goal, reverse=False):
+    """Path costs from every cell to ``goal`` as a flat ``float64`` array.
+
+    The wavefront is expanded with NumPy index arithmetic over the padded
+    layout: every frontier cell is offset in all eight directions at once
+    and each neighbour is offered the frontier cell's cost plus the cost of
+    stepping onto it. Cells whose cost went down are queued, and each sweep
+    takes the queued cells within ``STEP_BUCKET`` of the cheapest one, so
+    the expansion runs roughly in cost order while staying vectorised.
+    Blocked and unreachable cells hold ``UNREACHABLE``. With ``reverse`` the
+    costs are those of reaching every cell from ``goal`` instead, which
+    differ on grids with a cost layer.
+    """
+    target = grid.index(goal)
+    distances = np.full(grid.size, UNREACHABLE)
+    if grid.cells[target] != FREE:
+        return distances
+    blocked = grid.array.reshape(-1) != FREE
+    offsets = np.array(grid.offsets8, dtype=np.intp)
+    lengths = np.array(STEP_LENGTHS_8)
+    weights = None if grid.costs is None else grid.costs.reshape(-1)
+
+    # Scratch array for dropping duplicate cells from the queue without
+    # sorting: scatter each candidate's position, keep the ones that read it back
+    slot = np.empty(grid.size, dtype=np.intp)
+
+    queued = np.array([target], dtype=np.intp)
+    distances[target] = 0
+    while queued.size:
+        queued_distances = distances[queued]
+        near = queued_distances < queued_distances.min() + STEP_BUCKET
+        frontier, queued = queued[near], queued[~near]
+
+        # A neighbour reaches the goal through a frontier cell by stepping
+        # onto it, which costs that cell's weight times the step length;
+        # reversed, the step is onto the neighbour
+        ring = frontier[:, None] + offsets
+        if weights is None:
+            step_costs = lengths
+        elif reverse:
+            step_costs = weights[ring] * lengths
+        else:
+            step_costs = weights[frontier][:, None] * lengths
+        costs = (distances[frontier][:, None] + step_costs).ravel()
+        ring = ring.ravel()
+        better = ~blocked[ring] & (costs < distances[ring])
+        ring, costs = ring[better], costs[better]
+        np.minimum.at(distances, ring, costs)
+
+        queued = np.concatenate((queued, ring[distances[ring] == costs]))
+        positions = np.arange(queued.size)
+        slot[queued] = positions
+        queued = queued[slot[queued] == positions]
+    return distances
+
+
+def compute_flow(grid, distances):
+    """Direction of the cheapest next step for every cell, as an ``int8`` array.
+
+    Entries index ``DIRECTIONS_8`` (and ``grid.offsets8``); the goal,
+    blocked and unreachable cells hold -1.
+    """
+    height, width = grid.height, grid.width
+    field = distances.reshape(grid.array.shape)
+    weights = np.ones(grid.array.shape) if grid.costs is None else grid.costs
+    totals = np.stack([
+        field[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx]
+        + length * weights[1 + dy:height + 1 + dy, 1 + dx:width + 1 + dx]
+        for (dx, dy), length in zip(DIRECTIONS_8, STEP_LENGTHS_8)
+    ])
+    best = totals.argmin(axis=0)
+    here = field[1:-1, 1:-1]
+    ahead = np.take_along_axis(totals, best[None], axis=0)[0]
+    downhill = (here > 0) & np.isfinite(ahead)
+
+    flow = np.full(grid.array.shape, -1, dtype=np.int8)
+    flow[1:-1, 1:-1] = np.where(downhill, best, -1)
+    return flow.reshape(-1)
+
+
+class DistanceField:
+    """Distances and flow directions from every cell to one goal.
+
+    Once built, the path from any start is found by following the flow
+    field downhill, in time proportional to the path length.
+    """
+
+    def __init__(self, grid, goal, distances=None):
+        self.grid = grid
+        self.goal = tuple(goal)
+        self.distances = compute_distances(grid, goal) if distances is None else distances
+        self.flow = compute_flow(grid, self.distances)
+        self._distances = memoryview(self.distances)
+        self._flow = memoryview(self.flow)
+
+    def distance(self, node):
+        """Cost from ``node`` to the goal, or None when it cannot be reached."""
+        cost = self._distances[self.grid.index(node)]
+        return None if cost == UNREACHABLE else cost
+
+    def path_from(self, start):
+        """Shortest path from ``start`` to the goal as ``(x, y)`` nodes."""
+        grid = self.grid
+        node = grid.index(start)
+        if self._distances[node] == UNREACHABLE:
+            return []
+        offsets, flow, coords = grid.offsets8, self._flow, grid.coords
+        path = [coords(node)]
+        while self._distances[node]:
+            node += offsets[flow[node]]
+            path.append(coords(node))
+        return path
+
+    def save(self, path):
+        """Write the distances to a ``.npy`` file in the padded grid layout."""
+        np.save(path, self.distances.reshape(self.grid.array.shape))
+
+    @classmethod
+    def load(cls, path, grid):
+        """Memory-map a field written by ``save`` for the same ``grid``."""
+        distances = np.load(path, mmap_mode='r')
+        if distances.shape != grid.array.shape:
+            raise ValueError(f"{path} holds a {distances.shape} field, the grid is {grid.array.shape}")
+        distances = distances.reshape(-1)
+        if distances.dtype != np.float64 or np.any(np.isfinite(distances) & (grid.array.reshape(-1) != FREE)):
+            raise ValueError(f"{path} was computed for a different grid")
+        goals = np.flatnonzero(distances == 0)
+        if goals.size != 1:
+            raise ValueError(f"{path} does not hold a single goal")
+        return cls(grid, grid.coords(int(goals[0])), distances)
+
+
+def get_distance_field(grid, goal):
+    """Build or reuse the distance field towards ``goal`` on ``grid``."""
+    return cache.get(grid, lambda: DistanceField(grid, goal), tuple(goal))
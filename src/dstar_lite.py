@@ -0,0 +1,145 @@
+from grid import as_grid
+from heuristics import octile
+from priority_queue import OpenList
+from tracing import EXPAND, PUSH
+
+INFINITY = float('inf')
+# Keys are sums of float step costs; ones closer than this count as equal
+KEY_TOLERANCE = 1e-9
+
+
+class DStarLite:
+    """Incremental planner (D* Lite) that repairs its last search after edits.
+
+    The search runs backwards from the goal and keeps ``g``/``rhs`` values
+    between calls, so after ``update_cells`` only the nodes whose distance
+    actually changed are expanded again by the next ``replan``. The start
+    can follow a moving agent through ``move_start``.
+
+        planner = DStarLite(grid, start, goal)
+        path = planner.replan()
+        planner.update_cells([(x, y, 1)])
+        path = planner.replan()
+    """
+
+    def __init__(self, grid, start, goal, tracer=None):
+        self.grid = as_grid(grid)
+        self.start = self.grid.index(start)
+        self.goal = self.grid.index(goal)
+        self.tracer = tracer
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.km = 0
+        self._last_start = self.start
+        self.open_set = OpenList()
+        self.open_set.push(self.goal, self._key(self.goal))
+        # Nodes expanded by the most recent replan
+        self.expanded = set()
+
+    def _heuristic(self, node):
+        return octile(node, self.start, self.grid.stride)
+
+    def _key(self, node):
+        best = min(self.g.get(node, INFINITY), self.rhs.get(node, INFINITY))
+        return (best + self._heuristic(node) + self.km, best)
+
+    @staticmethod
+    def _key_less(key, other):
+        # A first component that differs from the start's only by rounding
+        # must fall through to the second, or a node that belongs before the
+        # start is left stale and the path read off ``g`` goes wrong
+        if abs(key[0] - other[0]) > KEY_TOLERANCE:
+            return key[0] < other[0]
+        return key[1] < other[1]
+
+    def _update_vertex(self, node):
+        cells, g = self.grid.cells, self.g
+        if node != self.goal:
+            best = INFINITY
+            if not cells[node]:
+                weights = self.grid.weights
+                for offset, step in self.grid.steps8:
+                    neighbor = node + offset
+                    if not cells[neighbor]:
+                        cost = g.get(neighbor, INFINITY) + step * weights[neighbor]
+                        if cost < best:
+                            best = cost
+            self.rhs[node] = best
+        if node in self.open_set:
+            self.open_set.remove(node)
+        if g.get(node, INFINITY) != self.rhs.get(node, INFINITY):
+            key = self._key(node)
+            self.open_set.push(node, key)
+            if self.tracer is not None and self.tracer.full:
+                self.tracer.emit(PUSH, self.grid.coords(node), None, self.rhs.get(node, INFINITY), key[0])
+
+    def _compute_shortest_path(self):
+        cells, offsets, open_set, g, rhs = self.grid.cells, self.grid.offsets8, self.open_set, self.g, self.rhs
+        full = self.tracer is not None and self.tracer.full
+        start = self.start
+        while open_set:
+            old_key, node = open_set.peek()
+            if not self._key_less(old_key, self._key(start)) and rhs.get(start, INFINITY) == g.get(start, INFINITY):
+                break
+            new_key = self._key(node)
+            if old_key < new_key:
+                open_set.push(node, new_key)
+                continue
+            open_set.pop()
+            self.expanded.add(node)
+            if full:
+                self.tracer.emit(EXPAND, self.grid.coords(node), None, rhs.get(node, INFINITY), new_key[0])
+            if g.get(node, INFINITY) > rhs.get(node, INFINITY):
+                g[node] = rhs[node]
+            else:
+                g[node] = INFINITY
+                self._update_vertex(node)
+            for offset in offsets:
+                neighbor = node + offset
+                if not cells[neighbor]:
+                    self._update_vertex(neighbor)
+
+    def update_cells(self, changes):
+        """Apply ``(x, y, blocked)`` edits and mark the affected nodes for repair."""
+        grid = self.grid
+        for x, y, value in changes:
+            node = grid.index((x, y))
+            grid.set_cell((x, y), value)
+            self._update_vertex(node)
+            for offset in grid.offsets8:
+                neighbor = node + offset
+                if not grid.cells[neighbor]:
+                    self._update_vertex(neighbor)
+
+    def move_start(self, start):
+        """Move the search start, e.g. as the agent follows the path."""
+        self.start = self.grid.index(start)
+        # Keys queued before the move were computed against the old start;
+        # raising km by the distance moved keeps them lower bounds
+        self.km += self._heuristic(self._last_start)
+        self._last_start = self.start
+
+    def replan(self):
+        """Bring the search up to date and return the path as ``(x, y)`` nodes."""
+        self.expanded = set()
+        self._compute_shortest_path()
+        cells, weights, steps, g = self.grid.cells, self.grid.weights, self.grid.steps8, self.g
+        node = self.start
+        if cells[node] or g.get(node, INFINITY) == INFINITY:
+            return []
+        path = [node]
+        while node != self.goal and len(path) <= self.grid.size:
+            best, best_cost = None, INFINITY
+            for offset, step in steps:
+                neighbor = node + offset
+                if not cells[neighbor]:
+                    cost = g.get(neighbor, INFINITY) + step * weights[neighbor]
+                    if cost < best_cost:
+                        best, best_cost = neighbor, cost
+            if best is None:
+                return []
+            node = best
+            path.append(node)
+        if node != self.goal:
+            return []
+        return [self.grid.coords(node) for node in path]
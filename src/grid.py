@@ -0,0 +1,207 @@
+import hashlib
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+FREE = 0
+BLOCKED = 1
+
+# Per-cell movement costs are stored as uint16, so this is the largest one
+MAX_COST = np.iinfo(np.uint16).max
+
+# (dx, dy) steps in the order the searches have always visited neighbours
+DIRECTIONS_4 = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIRECTIONS_8 = DIRECTIONS_4 + ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Length of each move in DIRECTIONS_8 order: octile geometry, where a
+# diagonal step is sqrt(2) times as long as a straight one
+SQRT2 = math.sqrt(2)
+STEP_LENGTHS_8 = (1.0,) * 4 + (SQRT2,) * 4
+
+
+class OccupancyGrid:
+    """Occupancy grid stored as one contiguous ``uint8`` array.
+
+    The array carries a one-cell blocked border, so every in-bounds cell can
+    look at its eight neighbours without a bounds check. Searches address
+    cells by their flat index into that padded array and step between them
+    with the precomputed ``offsets4``/``offsets8`` tables. ``index`` and
+    ``coords`` convert to and from the ``(x, y)`` tuples used everywhere else.
+
+    A grid may also carry a ``uint16`` cost layer of the same padded shape.
+    Entering a cell costs its value times the step length from
+    ``steps4``/``steps8`` (1 straight, sqrt(2) diagonal). Grids without a
+    layer cost 1 per cell, and ``weights`` reads as all ones for them.
+    """
+
+    def __init__(self, padded, costs=None):
+        if padded.ndim != 2 or padded.dtype != np.uint8 or not padded.flags.c_contiguous:
+            raise ValueError("OccupancyGrid needs a C-contiguous 2-D uint8 array")
+        if costs is not None and (costs.shape != padded.shape or costs.dtype != np.uint16
+                                  or not costs.flags.c_contiguous):
+            raise ValueError("The cost layer must be a C-contiguous uint16 array shaped like the grid")
+        self.array = padded
+        self.height = padded.shape[0] - 2
+        self.width = padded.shape[1] - 2
+        self.stride = padded.shape[1]
+        self.size = padded.size
+        self.cells = memoryview(padded.reshape(-1))
+        self._fingerprint = None
+        stride = self.stride
+        self.offsets4 = tuple(dy * stride + dx for dx, dy in DIRECTIONS_4)
+        self.offsets8 = tuple(dy * stride + dx for dx, dy in DIRECTIONS_8)
+        self.steps4 = tuple(zip(self.offsets4, STEP_LENGTHS_8[:4]))
+        self.steps8 = tuple(zip(self.offsets8, STEP_LENGTHS_8))
+        self._set_costs(costs)
+
+    def _set_costs(self, costs):
+        self.costs = costs
+        if costs is None:
+            # A zero-stride view, so a uniform grid never allocates a layer
+            self.weights = memoryview(np.broadcast_to(np.uint16(1), (self.size,)))
+        else:
+            self.weights = memoryview(costs.reshape(-1))
+
+    @property
+    def weighted(self):
+        return self.costs is not None
+
+    @classmethod
+    def from_array(cls, data, costs=None):
+        """Build a grid from rows of cells where any non-zero value is blocked.
+
+        ``costs``, if given, holds the movement cost of every cell (1 to
+        ``MAX_COST``) in the same layout.
+        """
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError("Grid data must be two-dimensional")
+        height, width = data.shape
+        padded = np.full((height + 2, width + 2), BLOCKED, dtype=np.uint8)
+        padded[1:-1, 1:-1] = data != 0
+        padded_costs = None
+        if costs is not None:
+            costs = np.asarray(costs)
+            if costs.shape != data.shape:
+                raise ValueError(f"Cost layer is {costs.shape}, the grid is {data.shape}")
+            if costs.size and (costs.min() < 1 or costs.max() > MAX_COST):
+                raise ValueError(f"Cell costs must be between 1 and {MAX_COST}")
+            padded_costs = np.ones(padded.shape, dtype=np.uint16)
+            padded_costs[1:-1, 1:-1] = costs
+        return cls(padded, padded_costs)
+
+    @classmethod
+    def empty(cls, width, height):
+        return cls.from_array(np.zeros((height, width), dtype=np.uint8))
+
+    def in_bounds(self, node):
+        x, y = node
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def index(self, node):
+        x, y = node
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"{node} is outside the {self.width}x{self.height} grid")
+        return (y + 1) * self.stride + x + 1
+
+    def coords(self, index):
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def is_free(self, node):
+        return self.cells[self.index(node)] == FREE
+
+    def set_cell(self, node, value):
+        self.cells[self.index(node)] = BLOCKED if value else FREE
+        self._fingerprint = None
+
+    def cost(self, node):
+        return self.weights[self.index(node)]
+
+    def set_cost(self, node, cost):
+        """Set one cell's movement cost, adding a cost layer if there is none."""
+        if not 1 <= cost <= MAX_COST:
+            raise ValueError(f"Cell costs must be between 1 and {MAX_COST}")
+        index = self.index(node)
+        if self.costs is None:
+            self._set_costs(np.ones(self.array.shape, dtype=np.uint16))
+        self.weights[index] = cost
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """Content hash of the grid, recomputed after ``set_cell`` edits.
+
+        Precomputed search structures are cached under this key, so edits
+        that bypass ``set_cell`` must be followed by ``touch()``.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr(self.array.shape).encode())
+            digest.update(self.array.data)
+            if self.costs is not None:
+                digest.update(self.costs.data)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def touch(self):
+        self._fingerprint = None
+
+    def to_array(self):
+        """Unpadded ``(height, width)`` view of the occupancy data."""
+        return self.array[1:-1, 1:-1]
+
+    def to_costs(self):
+        """Unpadded view of the cost layer, or None for a uniform-cost grid."""
+        return None if self.costs is None else self.costs[1:-1, 1:-1]
+
+    def copy(self):
+        return OccupancyGrid(self.array.copy(), None if self.costs is None else self.costs.copy())
+
+    # Row access keeps ``grid[y][x]`` and ``len(grid)`` working for callers
+    # written against the old list-of-lists grids.
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError(y)
+        return self.array[y + 1, 1:-1]
+
+    def __len__(self):
+        return self.height
+
+
+def as_grid(grid):
+    """Return ``grid`` as an OccupancyGrid, converting lists or arrays of rows."""
+    if isinstance(grid, OccupancyGrid):
+        return grid
+    return OccupancyGrid.from_array(grid)
+
+
+class GridCache:
+    """LRU of values derived from grids, keyed by grid fingerprint.
+
+    ``get(grid, build, *extra)`` returns the value kept for the grid's
+    current content and any ``extra`` key parts, calling ``build()`` to
+    make it on a miss. Only the ``size`` most recently used are kept.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def get(self, grid, build, *extra):
+        key = (grid.fingerprint(),) + extra
+        value = self._entries.get(key)
+        if value is None:
+            value = build()
+            self._entries[key] = value
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class GridEditor:
+    """Edits an OccupancyGrid in place and keeps the set of changed cells.
+
+    The grid's occupancy array is the only copy of the map: edits go
+    straight into it, ``on_change`` is called with each changed ``(x, y)``
+    (e.g. to redraw just that cell) and the cell joins a dirty set.
+    ``sync`` hands that set to the structures built on the grid as it was,
+    so keeping them current costs time in the number of edited cells.
+    A cell edited back to its old state drops out of the set.
+    """
+
+    def __init__(self, grid, start=None, goal=None, on_change=None):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.on_change = on_change
+        # Cells changed since the last sync, with their state at that sync
+        self._original = {}
+        self._fingerprint = grid.fingerprint()
+
+    @property
+    def changes(self):
+        """``(x, y, blocked)`` for every cell changed since the last ``sync``."""
+        return [(x, y, not blocked) for (x, y), blocked in self._original.items()]
+
+    def set_cell(self, node, blocked):
+        """Block or free one cell; returns False if it already was."""
+        blocked = bool(blocked)
+        if self.grid.is_free(node) != blocked:
+            return False
+        self.grid.set_cell(node, blocked)
+        if self._original.setdefault(node, not blocked) == blocked:
+            del self._original[node]
+        if self.on_change is not None:
+            self.on_change(node)
+        return True
+
+    def clear(self):
+        """Free every blocked cell and drop the start and goal."""
+        ys, xs = np.nonzero(self.grid.to_array())
+        for node in zip(xs.tolist(), ys.tolist()):
+            self.set_cell(node, False)
+        self.start = self.goal = None
+
+    def sync(self, cache=None, planners=()):
+        """Push the changes since the last sync and start a new dirty set.
+
+        ``cache`` is a PathCache whose entries for the old grid are carried
+        over by ``apply_edits``; ``planners`` are D* Lite planners on this
+        grid, repaired through ``update_cells``. Returns the changes pushed.
+        """
+        changes = self.changes
+        self._original = {}
+        if changes:
+            fingerprint = self.grid.fingerprint()
+            if cache is not None:
+                cache.apply_edits(self._fingerprint, fingerprint, changes)
+            for planner in planners:
+                planner.update_cells(changes)
+            self._fingerprint = fingerprint
+        return changes
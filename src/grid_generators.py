@@ -0,0 +1,107 @@
+import numpy as np
+
+GRID_KINDS = ('random', 'maze', 'rooms', 'open')
+
+
+def random_obstacles(width, height, density=0.25, seed=0):
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((height, width)) < density).astype(np.uint8)
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def open_field(width, height, density=0.02, seed=0):
+    """Mostly empty field with a few scattered short walls."""
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((height, width), dtype=np.uint8)
+    walls = int(width * height * density / 4)
+    for _ in range(walls):
+        x, y = int(rng.integers(width)), int(rng.integers(height))
+        length = int(rng.integers(2, 8))
+        if rng.random() < 0.5:
+            grid[y, x:x + length] = 1
+        else:
+            grid[y:y + length, x] = 1
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def maze(width, height, seed=0):
+    """Perfect maze carved by an iterative depth-first backtracker.
+
+    Passages run between the even-indexed cells, so every free cell is
+    reachable from every other through exactly one corridor system.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.ones((height, width), dtype=np.uint8)
+    cols, rows = (width + 1) // 2, (height + 1) // 2
+    visited = np.zeros((rows, cols), dtype=bool)
+    steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    grid[0, 0] = 0
+    while stack:
+        cx, cy = stack[-1]
+        options = [(dx, dy) for dx, dy in steps
+                   if 0 <= cx + dx < cols and 0 <= cy + dy < rows and not visited[cy + dy, cx + dx]]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = options[int(rng.integers(len(options)))]
+        nx, ny = cx + dx, cy + dy
+        visited[ny, nx] = True
+        grid[2 * cy + dy, 2 * cx + dx] = 0
+        grid[2 * ny, 2 * nx] = 0
+        stack.append((nx, ny))
+    return grid
+
+
+def rooms(width, height, seed=0, room_count=None):
+    """Rectangular rooms joined in sequence by L-shaped corridors."""
+    rng = np.random.default_rng(seed)
+    grid = np.ones((height, width), dtype=np.uint8)
+    if room_count is None:
+        room_count = max(2, width * height // 150)
+
+    centres = []
+    for _ in range(room_count):
+        room_w = int(rng.integers(3, max(4, width // 6) + 1))
+        room_h = int(rng.integers(3, max(4, height // 6) + 1))
+        x = int(rng.integers(0, max(1, width - room_w)))
+        y = int(rng.integers(0, max(1, height - room_h)))
+        grid[y:y + room_h, x:x + room_w] = 0
+        centres.append((x + room_w // 2, y + room_h // 2))
+
+    for (x0, y0), (x1, y1) in zip(centres, centres[1:]):
+        grid[y0, min(x0, x1):max(x0, x1) + 1] = 0
+        grid[min(y0, y1):max(y0, y1) + 1, x1] = 0
+    return grid
+
+
+def terrain_costs(width, height, max_cost=8, patch=8, seed=0):
+    """Cost layer of square ``patch`` sized areas costing 1 to ``max_cost`` each."""
+    rng = np.random.default_rng(seed)
+    rows, columns = -(-height // patch), -(-width // patch)
+    coarse = rng.integers(1, max_cost + 1, size=(rows, columns), dtype=np.uint16)
+    return np.repeat(np.repeat(coarse, patch, axis=0), patch, axis=1)[:height, :width]
+
+
+def generate(kind, width, height, density=0.25, seed=0):
+    if kind == 'random':
+        return random_obstacles(width, height, density, seed)
+    if kind == 'maze':
+        return maze(width, height, seed)
+    if kind == 'rooms':
+        return rooms(width, height, seed)
+    if kind == 'open':
+        return open_field(width, height, seed=seed)
+    raise ValueError(f"Unknown grid kind {kind!r}, expected one of {GRID_KINDS}")
+
+
+def corner_endpoints(grid):
+    """First free cell in reading order and the last one, as ``(x, y)``."""
+    free = np.flatnonzero(grid.reshape(-1) == 0)
+    width = grid.shape[1]
+    first, last = int(free[0]), int(free[-1])
+    return (first % width, first // width), (last % width, last // width)
@@ -0,0 +1,241 @@
+import numpy as np
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.uix.stencilview import StencilView
+
+from grid import MAX_COST, OccupancyGrid
+
+# Cell colours as RGBA bytes, matching the legend on the introduction screen
+FREE_COLOR = (255, 255, 255, 255)
+OBSTACLE_COLOR = (255, 0, 0, 255)
+START_COLOR = (0, 255, 0, 255)
+GOAL_COLOR = (0, 0, 128, 255)
+EXPLORED_COLOR = (255, 255, 0, 255)
+PATH_COLOR = (0, 0, 255, 255)
+# Free cells darken with their movement cost down to this grey level
+DARKEST_COST_SHADE = 96
+
+# Redraws are done per square tile of cells that changed
+TILE_SIZE = 64
+ZOOM_STEP = 1.2
+# Zooming in stops once a cell is this many pixels across
+MAX_CELL_PIXELS = 64
+
+
+def _packed(color):
+    return np.array(color, dtype=np.uint8).view(np.uint32)[0]
+
+
+def _cost_shades(max_cost):
+    """Packed grey pixels for every cost up to ``max_cost``, lightest for 1."""
+    levels = np.minimum((np.arange(MAX_COST + 1) - 1) / (max_cost - 1), 1).clip(0)
+    grey = (255 - levels * (255 - DARKEST_COST_SHADE)).astype(np.uint8)
+    return np.stack((grey, grey, grey, np.full_like(grey, 255)), axis=1).view(np.uint32)[:, 0]
+
+
+class GridView(StencilView):
+    """Draws an OccupancyGrid as one texture with a pixel per cell.
+
+    Occupancy, costs, the explored set and the path are kept as NumPy
+    arrays and composed into RGBA pixels, so the widget's size does not
+    depend on the map's. Changes only mark the tiles they touch as dirty,
+    and the next frame re-blits just those tiles. The scroll wheel zooms
+    around the pointer, dragging with the right or middle button pans and
+    double-clicking either of them resets the view. Left clicks on a cell
+    dispatch ``on_cell_press`` with its ``(x, y)``.
+    """
+
+    __events__ = ('on_cell_press',)
+
+    def __init__(self, grid=None, **kwargs):
+        super(GridView, self).__init__(**kwargs)
+        self.grid = None
+        self.start = None
+        self.goal = None
+        self.zoom = 1.0
+        self.pan = (0.0, 0.0)
+        self.texture = None
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rectangle = Rectangle()
+        self._redraw = Clock.create_trigger(self._draw_dirty)
+        self.bind(pos=self._update_rectangle, size=self._update_rectangle)
+        self.set_grid(grid if grid is not None else OccupancyGrid.empty(10, 10))
+
+    def on_cell_press(self, node):
+        pass
+
+    def set_grid(self, grid, start=None, goal=None):
+        """Show ``grid``, clearing any search shown on the previous one."""
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        shape = (grid.height, grid.width)
+        self.explored = np.zeros(shape, dtype=bool)
+        self.on_path = np.zeros(shape, dtype=bool)
+        costs = grid.to_costs()
+        self._max_cost = int(costs.max()) if costs is not None and costs.size else 1
+        if self._max_cost > 1:
+            self._shades = _cost_shades(self._max_cost)
+        self._dirty = np.zeros((-(-grid.height // TILE_SIZE), -(-grid.width // TILE_SIZE)), dtype=bool)
+        if self.texture is None or self.texture.size != (grid.width, grid.height):
+            self.texture = Texture.create(size=(grid.width, grid.height), colorfmt='rgba')
+            self.texture.mag_filter = 'nearest'
+            self.texture.min_filter = 'nearest'
+            # Texture rows then run top to bottom like grid rows
+            self.texture.flip_vertical()
+            self._rectangle.texture = self.texture
+            self.reset_view()
+        self.mark_dirty(0, 0, grid.width, grid.height)
+
+    def set_endpoints(self, start, goal):
+        for node in (self.start, self.goal, start, goal):
+            if node is not None:
+                self.mark_dirty(node[0], node[1], node[0] + 1, node[1] + 1)
+        self.start = start
+        self.goal = goal
+
+    def refresh_cell(self, node):
+        """Redraw one cell after its occupancy or cost was edited."""
+        self.mark_dirty(node[0], node[1], node[0] + 1, node[1] + 1)
+
+    def add_explored(self, nodes):
+        self._mark_nodes(self.explored, nodes)
+
+    def add_path(self, nodes):
+        self._mark_nodes(self.on_path, nodes)
+
+    def clear_search(self):
+        """Remove the explored set and path, redrawing only where they were."""
+        for layer in (self.explored, self.on_path):
+            ys, xs = np.nonzero(layer)
+            if len(xs):
+                layer[:] = False
+                self._mark_tiles(xs, ys)
+
+    def _mark_nodes(self, layer, nodes):
+        nodes = np.array(list(nodes), dtype=np.intp).reshape(-1, 2)
+        if len(nodes):
+            layer[nodes[:, 1], nodes[:, 0]] = True
+            self._mark_tiles(nodes[:, 0], nodes[:, 1])
+
+    def _mark_tiles(self, xs, ys):
+        self._dirty[ys // TILE_SIZE, xs // TILE_SIZE] = True
+        self._redraw()
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """Redraw the cells in ``[x0, x1) x [y0, y1)`` on the next frame."""
+        self._dirty[y0 // TILE_SIZE:-(-y1 // TILE_SIZE), x0 // TILE_SIZE:-(-x1 // TILE_SIZE)] = True
+        self._redraw()
+
+    def compose(self, x0, y0, x1, y1):
+        """RGBA pixels for the cells in ``[x0, x1) x [y0, y1)``."""
+        pixels = np.empty((y1 - y0, x1 - x0, 4), dtype=np.uint8)
+        # Whole pixels are written as one uint32 each
+        packed = pixels.view(np.uint32)[..., 0]
+        costs = self.grid.to_costs()
+        if costs is not None and self._max_cost > 1:
+            packed[:] = self._shades[costs[y0:y1, x0:x1]]
+        else:
+            packed[:] = _packed(FREE_COLOR)
+        packed[self.grid.to_array()[y0:y1, x0:x1] != 0] = _packed(OBSTACLE_COLOR)
+        packed[self.explored[y0:y1, x0:x1]] = _packed(EXPLORED_COLOR)
+        packed[self.on_path[y0:y1, x0:x1]] = _packed(PATH_COLOR)
+        for node, color in ((self.start, START_COLOR), (self.goal, GOAL_COLOR)):
+            if node is not None and x0 <= node[0] < x1 and y0 <= node[1] < y1:
+                pixels[node[1] - y0, node[0] - x0] = color
+        return pixels
+
+    def _blit(self, x0, y0, x1, y1):
+        self.texture.blit_buffer(self.compose(x0, y0, x1, y1).tobytes(), pos=(x0, y0), size=(x1 - x0, y1 - y0),
+                                 colorfmt='rgba', bufferfmt='ubyte')
+
+    def _draw_dirty(self, *args):
+        rows, columns = np.nonzero(self._dirty)
+        if len(rows) * 2 > self._dirty.size:
+            # Mostly dirty: one blit is cheaper than many small ones
+            self._blit(0, 0, self.grid.width, self.grid.height)
+        else:
+            for row, column in zip(rows.tolist(), columns.tolist()):
+                x0, y0 = column * TILE_SIZE, row * TILE_SIZE
+                self._blit(x0, y0, min(x0 + TILE_SIZE, self.grid.width), min(y0 + TILE_SIZE, self.grid.height))
+        self._dirty[:] = False
+        self.canvas.ask_update()
+
+    # View transform: at zoom 1 the whole map fits the widget, centred
+
+    def fit_scale(self):
+        return min(self.width / self.grid.width, self.height / self.grid.height)
+
+    def cell_pixels(self):
+        return self.fit_scale() * self.zoom
+
+    def map_rect(self):
+        scale = self.cell_pixels()
+        width, height = self.grid.width * scale, self.grid.height * scale
+        return (self.center_x - width / 2 + self.pan[0], self.center_y - height / 2 + self.pan[1], width, height)
+
+    def reset_view(self):
+        self.zoom = 1.0
+        self.pan = (0.0, 0.0)
+        self._update_rectangle()
+
+    def _update_rectangle(self, *args):
+        x, y, width, height = self.map_rect()
+        self._rectangle.pos = (x, y)
+        self._rectangle.size = (width, height)
+
+    def cell_at(self, pos):
+        """The ``(x, y)`` cell under a window position, or None."""
+        x, y, width, height = self.map_rect()
+        scale = self.cell_pixels()
+        if not scale:
+            return None
+        node = (int((pos[0] - x) // scale), int((y + height - pos[1]) // scale))
+        return node if self.grid.in_bounds(node) else None
+
+    def zoom_at(self, pos, factor):
+        """Zoom by ``factor``, keeping the point under ``pos`` in place."""
+        fit = self.fit_scale()
+        zoom = min(max(self.zoom * factor, 1.0), max(1.0, MAX_CELL_PIXELS / fit) if fit else 1.0)
+        factor = zoom / self.zoom
+        x, y, width, height = self.map_rect()
+        new_x = pos[0] - (pos[0] - x) * factor
+        new_y = pos[1] - (pos[1] - y) * factor
+        self.zoom = zoom
+        self.pan = (new_x - self.center_x + width * factor / 2, new_y - self.center_y + height * factor / 2)
+        self._update_rectangle()
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        if touch.is_mouse_scrolling:
+            if touch.button == 'scrolldown':
+                self.zoom_at(touch.pos, ZOOM_STEP)
+            elif touch.button == 'scrollup':
+                self.zoom_at(touch.pos, 1 / ZOOM_STEP)
+            return True
+        if touch.button in ('right', 'middle'):
+            if touch.is_double_tap:
+                self.reset_view()
+            else:
+                touch.grab(self)
+            return True
+        node = self.cell_at(touch.pos)
+        if node is not None:
+            self.dispatch('on_cell_press', node)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is self:
+            self.pan = (self.pan[0] + touch.dx, self.pan[1] + touch.dy)
+            self._update_rectangle()
+            return True
+        return super(GridView, self).on_touch_move(touch)
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is self:
+            touch.ungrab(self)
+            return True
+        return super(GridView, self).on_touch_up(touch)
@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+from grid import SQRT2
+
+# Every heuristic takes two cell indices in the padded grid layout and the
+# grid stride, and returns a lower bound on the cost of getting from the
+# first to the second (except ``Weighted``, which trades that for speed).
+# They stick to int arithmetic on the indices so the per-node call stays
+# cheap; ``many`` evaluates one for a whole array of nodes with NumPy.
+
+
+def manhattan(a, b, stride):
+    """Admissible only on four-connected grids."""
+    ay, ax = divmod(a, stride)
+    by, bx = divmod(b, stride)
+    return abs(ax - bx) + abs(ay - by)
+
+
+def octile(a, b, stride):
+    """Exact on an empty eight-connected grid where diagonals cost sqrt(2)."""
+    ay, ax = divmod(a, stride)
+    by, bx = divmod(b, stride)
+    dx, dy = abs(ax - bx), abs(ay - by)
+    if dx < dy:
+        return dy + (SQRT2 - 1) * dx
+    return dx + (SQRT2 - 1) * dy
+
+
+def chebyshev(a, b, stride):
+    """Fewest eight-connected moves, for searches that count every step as 1."""
+    ay, ax = divmod(a, stride)
+    by, bx = divmod(b, stride)
+    return max(abs(ax - bx), abs(ay - by))
+
+
+def euclidean(a, b, stride):
+    """Straight-line distance, the bound for any-angle paths."""
+    ay, ax = divmod(a, stride)
+    by, bx = divmod(b, stride)
+    return math.hypot(ax - bx, ay - by)
+
+
+def default_heuristic(diagonal=True, any_angle=False):
+    """The tightest admissible heuristic for a search's kind of moves."""
+    if any_angle:
+        return euclidean
+    return octile if diagonal else manhattan
+
+
+class Weighted:
+    """Weighted A*: scales another heuristic by ``weight``.
+
+    With a consistent base heuristic the paths found cost at most
+    ``weight`` times the optimum, usually after far fewer expansions.
+    """
+
+    def __init__(self, heuristic, weight):
+        if weight < 1:
+            raise ValueError("The heuristic weight must be at least 1")
+        self.heuristic = heuristic
+        self.weight = weight
+
+    def __call__(self, a, b, stride):
+        return self.weight * self.heuristic(a, b, stride)
+
+    def many(self, nodes, target, stride):
+        return self.weight * many(self.heuristic, nodes, target, stride)
+
+
+class Landmarks:
+    """ALT heuristic from exact costs to and from a few landmark cells.
+
+    Both tables are ``(K, grid.size)`` arrays over the padded layout:
+    ``from_landmarks[k]`` holds the cost from landmark ``k`` to every cell
+    and ``to_landmarks[k]`` the cost from every cell to it, with ``inf``
+    where there is no path. By the triangle inequality both
+    ``from[k][b] - from[k][a]`` and ``to[k][a] - to[k][b]`` are lower
+    bounds on the cost from ``a`` to ``b``; the heuristic is the largest,
+    together with the ``base`` heuristic if one is given (landmark bounds
+    tend to be loose close to the goal, where a geometric one is tight).
+    ``slack`` is taken off every landmark bound to absorb rounding in
+    compact (e.g. ``float32``) tables.
+    """
+
+    def __init__(self, from_landmarks, to_landmarks, base=None, slack=0.0):
+        self.from_landmarks = np.asarray(from_landmarks)
+        self.to_landmarks = np.asarray(to_landmarks)
+        self.base = base
+        self.slack = slack
+        self._rows = [(memoryview(np.ascontiguousarray(source)), memoryview(np.ascontiguousarray(target)))
+                      for source, target in zip(self.from_landmarks, self.to_landmarks)]
+
+    def __call__(self, a, b, stride):
+        best = 0
+        for from_landmark, to_landmark in self._rows:
+            # Cells the landmark cannot reach give inf - inf; NaN never wins
+            bound = from_landmark[b] - from_landmark[a]
+            if bound > best:
+                best = bound
+            bound = to_landmark[a] - to_landmark[b]
+            if bound > best:
+                best = bound
+        best -= self.slack
+        if self.base is not None:
+            bound = self.base(a, b, stride)
+            if bound > best:
+                best = bound
+        return best if best > 0 else 0
+
+    def many(self, nodes, target, stride):
+        nodes = np.asarray(nodes)
+        with np.errstate(invalid='ignore'):
+            bounds = np.concatenate((
+                self.from_landmarks[:, [target]] - self.from_landmarks[:, nodes],
+                self.to_landmarks[:, nodes] - self.to_landmarks[:, [target]],
+            ))
+        best = np.maximum(np.nanmax(bounds, axis=0, initial=0) - self.slack, 0)
+        if self.base is not None:
+            best = np.maximum(best, many(self.base, nodes, target, stride))
+        return best
+
+
+def _offsets(nodes, target, stride):
+    ys, xs = np.divmod(np.asarray(nodes), stride)
+    ty, tx = divmod(target, stride)
+    return np.abs(xs - tx), np.abs(ys - ty)
+
+
+def _manhattan_many(nodes, target, stride):
+    dx, dy = _offsets(nodes, target, stride)
+    return dx + dy
+
+
+def _octile_many(nodes, target, stride):
+    dx, dy = _offsets(nodes, target, stride)
+    return np.maximum(dx, dy) + (SQRT2 - 1) * np.minimum(dx, dy)
+
+
+def _chebyshev_many(nodes, target, stride):
+    dx, dy = _offsets(nodes, target, stride)
+    return np.maximum(dx, dy)
+
+
+def _euclidean_many(nodes, target, stride):
+    dx, dy = _offsets(nodes, target, stride)
+    return np.hypot(dx, dy)
+
+
+_VECTORISED = {
+    manhattan: _manhattan_many,
+    octile: _octile_many,
+    chebyshev: _chebyshev_many,
+    euclidean: _euclidean_many,
+}
+
+
+def many(heuristic, nodes, target, stride):
+    """Evaluate ``heuristic`` from every node in ``nodes`` to ``target`` at once."""
+    vectorised = _VECTORISED.get(heuristic)
+    if vectorised is not None:
+        return vectorised(nodes, target, stride)
+    if hasattr(heuristic, 'many'):
+        return heuristic.many(nodes, target, stride)
+    return np.array([heuristic(node, target, stride) for node in np.asarray(nodes).tolist()], dtype=np.float64)
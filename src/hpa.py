@@ -0,0 +1,239 @@
+import heapq
+
+import numpy as np
+
+from grid import SQRT2, GridCache
+from heuristics import octile
+from priority_queue import OpenList
+from tracing import EXPAND, PUSH, RELAX
+
+# Entrances at least this wide get a transition at each end instead of one
+# in the middle, as in the original HPA* paper
+MAX_SINGLE_ENTRANCE = 6
+DEFAULT_CLUSTER_SIZE = 10
+
+# Abstract graphs for the most recently used maps, keyed by
+# (grid fingerprint, cluster size)
+CACHE_SIZE = 4
+cache = GridCache(CACHE_SIZE)
+
+
+def cluster_search(grid, cluster_of, source, cluster, reverse=False):
+    """Dijkstra from ``source`` that never leaves ``cluster``.
+
+    Returns ``(distance, parent)`` dicts over every reachable cell of the
+    cluster. With ``reverse`` the distances are costs of reaching ``source``
+    rather than of leaving it, which differ on grids with a cost layer.
+    """
+    cells, weights, steps = grid.cells, grid.weights, grid.steps8
+    distance = {source: 0}
+    parent = {}
+    settled = set()
+    heap = [(0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        for offset, step in steps:
+            neighbor = node + offset
+            if cells[neighbor] or cluster_of[neighbor] != cluster:
+                continue
+            new_distance = d + step * weights[node if reverse else neighbor]
+            if new_distance < distance.get(neighbor, float('inf')):
+                distance[neighbor] = new_distance
+                parent[neighbor] = node
+                heapq.heappush(heap, (new_distance, neighbor))
+    return distance, parent
+
+
+def _trace_back(parent, source, node):
+    path = [node]
+    while node != source:
+        node = parent[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+class AbstractGraph:
+    """HPA* abstraction of an occupancy grid.
+
+    The grid is cut into square clusters. Every entrance between adjacent
+    clusters contributes one or two transitions, a pair of facing cells that
+    become abstract nodes joined by a single-step inter edge each way. Abstract nodes of
+    the same cluster are joined by intra edges whose cost and cell path come
+    from a search confined to that cluster.
+    """
+
+    def __init__(self, grid, cluster_size=DEFAULT_CLUSTER_SIZE):
+        self.cluster_size = cluster_size
+        self.columns = -(-grid.width // cluster_size)
+        self.rows = -(-grid.height // cluster_size)
+
+        ys, xs = np.indices((grid.height, grid.width))
+        cluster_of = np.full(grid.array.shape, -1, dtype=np.int32)
+        cluster_of[1:-1, 1:-1] = (ys // cluster_size) * self.columns + xs // cluster_size
+        self.cluster_of = memoryview(cluster_of.reshape(-1))
+
+        self.nodes = [[] for _ in range(self.columns * self.rows)]
+        self.edges = {}
+        self.paths = {}
+        self._find_transitions(grid)
+        for cluster, nodes in enumerate(self.nodes):
+            self._connect_cluster(grid, cluster, nodes)
+
+    def _add_node(self, node):
+        if node not in self.edges:
+            self.edges[node] = []
+            self.nodes[self.cluster_of[node]].append(node)
+
+    def _add_transition(self, a, b, step, weights):
+        self._add_node(a)
+        self._add_node(b)
+        self.edges[a].append((b, step * weights[b]))
+        self.edges[b].append((a, step * weights[a]))
+
+    def _find_transitions(self, grid):
+        size = self.cluster_size
+        for x in range(size - 1, grid.width - 1, size):
+            self._scan_border(grid, x, grid.height, lambda u, v: grid.index((u, v)), 1, grid.stride)
+        for y in range(size - 1, grid.height - 1, size):
+            self._scan_border(grid, y, grid.width, lambda u, v: grid.index((v, u)), grid.stride, 1)
+
+    def _scan_border(self, grid, edge, length, index, across, along):
+        """Add transitions over the border between line ``edge`` and ``edge + 1``.
+
+        ``index(edge, position)`` maps border coordinates to a cell index,
+        ``across`` steps over the border and ``along`` steps beside it.
+        """
+        cells, weights, size = grid.cells, grid.weights, self.cluster_size
+        # Straight crossings: each maximal run of facing free cell pairs
+        # within one cluster's side of the border is an entrance
+        for band_start in range(0, length, size):
+            band_end = min(band_start + size, length)
+            run = []
+            for position in range(band_start, band_end + 1):
+                near = index(edge, position) if position < band_end else None
+                if near is not None and not cells[near] and not cells[near + across]:
+                    run.append(near)
+                    continue
+                if run:
+                    if len(run) < MAX_SINGLE_ENTRANCE:
+                        picks = (run[len(run) // 2],)
+                    else:
+                        picks = (run[0], run[-1])
+                    for near_cell in picks:
+                        self._add_transition(near_cell, near_cell + across, 1, weights)
+                    run = []
+
+        # A diagonal step whose two elbow cells are both blocked is the only
+        # way across at that spot, so it gets a transition of its own. Steps
+        # through a cluster corner cross both kinds of border; they are taken
+        # from the vertical-border pass only (where ``along`` is the stride).
+        for position in range(length):
+            near = index(edge, position)
+            if cells[near] or not cells[near + across]:
+                continue
+            for side in (-along, along):
+                far = near + across + side
+                if cells[far] or not cells[near + side]:
+                    continue
+                if along == 1 and self.cluster_of[near + side] != self.cluster_of[near]:
+                    continue
+                self._add_transition(near, far, SQRT2, weights)
+
+    def _connect_cluster(self, grid, cluster, nodes):
+        for source in nodes:
+            distance, parent = cluster_search(grid, self.cluster_of, source, cluster)
+            for target in nodes:
+                if target != source and target in distance:
+                    self.edges[source].append((target, distance[target]))
+                    self.paths[(source, target)] = _trace_back(parent, source, target)
+
+
+def get_abstract_graph(grid, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """Build or reuse the HPA* abstraction of ``grid``."""
+    return cache.get(grid, lambda: AbstractGraph(grid, cluster_size), cluster_size)
+
+
+def find_path(graph, grid, source, target, tracer=None):
+    """Answer one query on ``grid`` using its prebuilt ``AbstractGraph``.
+
+    Start and goal are linked into the abstract graph through searches
+    confined to their own clusters, the abstract graph is searched with A*,
+    and the abstract path is refined back into cells from the cached intra
+    edge paths. Returns ``(path, explored)`` as cell indices.
+    """
+    cluster_of, stride, coords = graph.cluster_of, grid.stride, grid.coords
+    full = tracer is not None and tracer.full
+    # Linking a blocked endpoint into the graph would route a path onto it
+    if grid.cells[source] or grid.cells[target]:
+        return [], set()
+    if source == target:
+        return [source], {source}
+
+    source_cluster, target_cluster = cluster_of[source], cluster_of[target]
+    source_distance, source_parent = cluster_search(grid, cluster_of, source, source_cluster)
+    target_distance, target_parent = cluster_search(grid, cluster_of, target, target_cluster, reverse=True)
+    explored = set(source_distance) | set(target_distance)
+
+    # Edges for this query only, so the cached graph is never modified
+    extra = {source: [(node, source_distance[node]) for node in graph.nodes[source_cluster]
+                      if node != source and node in source_distance]}
+    for node in graph.nodes[target_cluster]:
+        if node != target and node in target_distance:
+            extra.setdefault(node, []).append((target, target_distance[node]))
+    if target in source_distance:
+        extra[source].append((target, source_distance[target]))
+
+    came_from = {}
+    g_score = {source: 0}
+    closed_set = set()
+    open_set = OpenList()
+    open_set.push(source, octile(source, target, stride))
+    while open_set:
+        current = open_set.pop()
+        if current == target:
+            break
+        closed_set.add(current)
+        if full:
+            parent = came_from.get(current)
+            tracer.emit(EXPAND, coords(current), parent and coords(parent), g_score[current],
+                        g_score[current] + octile(current, target, stride))
+        for neighbor, cost in graph.edges.get(current, []) + extra.get(current, []):
+            if neighbor in closed_set:
+                continue
+            tentative_g_score = g_score[current] + cost
+            if neighbor not in open_set:
+                kind = PUSH
+            elif tentative_g_score >= g_score[neighbor]:
+                continue
+            else:
+                kind = RELAX
+            came_from[neighbor] = current
+            g_score[neighbor] = tentative_g_score
+            f = tentative_g_score + octile(neighbor, target, stride)
+            open_set.push(neighbor, f)
+            if full:
+                tracer.emit(kind, coords(neighbor), coords(current), tentative_g_score, f)
+    else:
+        return [], explored | closed_set
+
+    abstract_path = [target]
+    while abstract_path[-1] != source:
+        abstract_path.append(came_from[abstract_path[-1]])
+    abstract_path.reverse()
+
+    path = [source]
+    for a, b in zip(abstract_path, abstract_path[1:]):
+        if (a, b) in graph.paths:
+            segment = graph.paths[(a, b)]
+        elif a == source and b in source_distance:
+            segment = _trace_back(source_parent, source, b)
+        elif b == target and a in target_distance:
+            segment = _trace_back(target_parent, target, a)[::-1]
+        else:
+            segment = [a, b]
+        path.extend(segment[1:])
+    return path, explored | closed_set
@@ -0,0 +1,82 @@
+import numpy as np
+
+from grid import DIRECTIONS_8, GridCache
+
+# Jump tables for the most recently used maps, keyed by grid fingerprint
+CACHE_SIZE = 4
+cache = GridCache(CACHE_SIZE)
+
+
+def _shifted(array, dx, dy, fill):
+    """``out[y, x] == array[y + dy, x + dx]``, with ``fill`` past the edges."""
+    out = np.full_like(array, fill)
+    height, width = array.shape
+    out[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+        array[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+    return out
+
+
+def _walk(blocked, stops, dx, dy):
+    """Fill one direction's table by sweeping lines against the direction.
+
+    Every cell's entry depends only on the next cell along ``(dx, dy)``, so
+    whole rows (or columns, for horizontal moves) are resolved at once.
+    """
+    table = np.zeros(blocked.shape, dtype=np.int32)
+    height, width = blocked.shape
+    if dy:
+        lines = range(height - 2, 0, -1) if dy > 0 else range(1, height - 1)
+        for y in lines:
+            columns = slice(1 + dx, width - 1 + dx)
+            nb = blocked[y + dy, columns]
+            ns = stops[y + dy, columns]
+            nt = table[y + dy, columns]
+            table[y, 1:-1] = np.where(nb, 0, np.where(ns, 1, np.where(nt > 0, nt + 1, nt - 1)))
+    else:
+        lines = range(width - 2, 0, -1) if dx > 0 else range(1, width - 1)
+        for x in lines:
+            nb = blocked[1:-1, x + dx]
+            ns = stops[1:-1, x + dx]
+            nt = table[1:-1, x + dx]
+            table[1:-1, x] = np.where(nb, 0, np.where(ns, 1, np.where(nt > 0, nt + 1, nt - 1)))
+    table[blocked] = 0
+    return table
+
+
+def compute_jump_distances(grid):
+    """Precompute JPS+ jump distances for every cell and direction.
+
+    Returns an ``int32`` array of shape ``(8, grid.size)`` indexed by the
+    position in ``DIRECTIONS_8`` and the flat cell index. A positive entry
+    is the number of steps to the next jump point in that direction; zero or
+    a negative entry is minus the number of free steps before a wall.
+    """
+    blocked = grid.array.astype(bool)
+    free = ~blocked
+    tables = [None] * 8
+
+    def at(dx, dy):
+        return _shifted(blocked, dx, dy, True)
+
+    # Straight moves stop where a forced neighbour appears beside the cell
+    for k, (dx, dy) in enumerate(DIRECTIONS_8[:4]):
+        if dx:
+            stops = free & ((at(0, 1) & ~at(dx, 1)) | (at(0, -1) & ~at(dx, -1)))
+        else:
+            stops = free & ((at(1, 0) & ~at(1, dy)) | (at(-1, 0) & ~at(-1, dy)))
+        tables[k] = _walk(blocked, stops, dx, dy)
+
+    # Diagonal moves stop at forced neighbours or where a straight jump
+    # along either component would find a jump point
+    straight = {direction: tables[k] for k, direction in enumerate(DIRECTIONS_8[:4])}
+    for k, (dx, dy) in enumerate(DIRECTIONS_8[4:], start=4):
+        forced = (at(-dx, 0) & ~at(-dx, dy)) | (at(0, -dy) & ~at(dx, -dy))
+        stops = free & (forced | (straight[(dx, 0)] > 0) | (straight[(0, dy)] > 0))
+        tables[k] = _walk(blocked, stops, dx, dy)
+
+    return np.stack(tables).reshape(8, -1)
+
+
+def get_jump_distances(grid):
+    """Cached ``compute_jump_distances`` for static maps queried many times."""
+    return cache.get(grid, lambda: compute_jump_distances(grid))
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+
+from distance_field import compute_distances
+from grid import FREE, GridCache
+from heuristics import Landmarks, default_heuristic
+
+DEFAULT_LANDMARKS = 8
+
+# Landmark tables for the most recently used maps, keyed by
+# (grid fingerprint, landmark count)
+CACHE_SIZE = 4
+cache = GridCache(CACHE_SIZE)
+
+
+def select_landmarks(grid, count=DEFAULT_LANDMARKS):
+    """Pick up to ``count`` landmarks by farthest-point selection.
+
+    The first landmark is the cell farthest from the first free cell; each
+    next one is the free cell farthest from every landmark chosen so far,
+    which puts them on the fringes of the map where their bounds are
+    tightest. Returns the landmark cell indices and, for each, the cost
+    from every cell to it.
+    """
+    free = grid.array.reshape(-1) == FREE
+    if not free.any():
+        return [], []
+    seed = compute_distances(grid, grid.coords(int(np.flatnonzero(free)[0])))
+    node = int(np.argmax(np.where(np.isfinite(seed), seed, -1)))
+
+    # Cost to the nearest landmark; cells no landmark reaches stay inf, so
+    # another connected component is picked before the next far-off cell
+    nearest = np.where(free, np.inf, -1)
+    cells, distances = [], []
+    while len(cells) < count and nearest[node] > 0:
+        cells.append(node)
+        distances.append(compute_distances(grid, grid.coords(node)))
+        nearest = np.minimum(nearest, np.where(free, distances[-1], -1))
+        node = int(np.argmax(nearest))
+    return cells, distances
+
+
+class LandmarkTables:
+    """Exact costs to and from a few landmark cells, and the ALT heuristic over them.
+
+    ``tables`` is a ``float32`` array of shape ``(D, K, rows, columns)`` in
+    the padded grid layout: the costs from each of the ``K`` landmarks to
+    every cell and, when the grid has a cost layer (``D == 2``), the costs
+    from every cell to each landmark. Without a cost layer the two are the
+    same and only one set is kept. ``heuristic`` plugs into any search
+    that takes a ``heuristic=`` argument.
+    """
+
+    def __init__(self, grid, tables, path=None):
+        self.tables = tables
+        self.path = path
+        count = tables.shape[1]
+        from_landmarks = tables[0].reshape(count, -1)
+        to_landmarks = tables[-1].reshape(count, -1)
+        self.cells = [int(cell) for cell in np.argmin(to_landmarks, axis=1)]
+        # Each bound subtracts two rounded float32 costs
+        largest = np.max(tables, where=np.isfinite(tables), initial=0)
+        self.heuristic = Landmarks(from_landmarks, to_landmarks, base=default_heuristic(),
+                                   slack=float(largest) * np.finfo(np.float32).eps)
+
+    @classmethod
+    def build(cls, grid, count=DEFAULT_LANDMARKS):
+        cells, to_landmarks = select_landmarks(grid, count)
+        tables = [to_landmarks]
+        if grid.weighted:
+            tables.insert(0, [compute_distances(grid, grid.coords(cell), reverse=True) for cell in cells])
+        tables = np.array(tables, dtype=np.float32).reshape((len(tables), len(cells)) + grid.array.shape)
+        return cls(grid, tables)
+
+    def save(self, path):
+        """Write the tables to a ``.npy`` file that ``load`` can memory-map."""
+        np.save(path, self.tables)
+        self.path = path
+
+    @classmethod
+    def load(cls, path, grid):
+        """Memory-map tables written by ``save`` for the same ``grid``."""
+        tables = np.load(path, mmap_mode='r')
+        if (tables.ndim != 4 or tables.shape[0] != (2 if grid.weighted else 1)
+                or tables.shape[2:] != grid.array.shape or tables.dtype != np.float32):
+            raise ValueError(f"{path} does not hold landmark tables for a {grid.array.shape} grid")
+        if np.any(np.isfinite(tables) & (grid.array != FREE)):
+            raise ValueError(f"{path} was computed for a different grid")
+        return cls(grid, tables, path)
+
+
+def landmarks_path(map_path, grid, count=DEFAULT_LANDMARKS):
+    """Where the tables for ``grid`` live next to its map file.
+
+    The name carries the grid fingerprint, so tables for an older version
+    of the map are never picked up.
+    """
+    return f"{map_path}.alt{count}-{grid.fingerprint()[:16]}.npy"
+
+
+def get_landmarks(grid, count=DEFAULT_LANDMARKS, map_path=None):
+    """Build or reuse the landmark tables for ``grid``.
+
+    With ``map_path`` the tables are memory-mapped from next to the map
+    when they were saved there before, and saved there otherwise.
+    """
+    def build():
+        path = landmarks_path(map_path, grid, count) if map_path else None
+        if path and os.path.exists(path):
+            return LandmarkTables.load(path, grid)
+        landmarks = LandmarkTables.build(grid, count)
+        if path:
+            landmarks.save(path)
+        return landmarks
+
+    return cache.get(grid, build, count)
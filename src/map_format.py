@@ -0,0 +1,191 @@
+import json
+import os
+import struct
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+from grid import BLOCKED, OccupancyGrid
+
+# Binary map files start with a fixed header followed by the padded
+# occupancy bytes (border included), so the data maps straight into an
+# OccupancyGrid. A cost layer, when present, follows as padded uint16.
+MAGIC = b'PFMAP\r\n\x1a'
+VERSION = 1
+HEADER = struct.Struct('<8sHHII')  # magic, version, flags, height, width
+HEADER_SIZE = 64
+FLAG_COSTS = 1
+EXTENSION = '.pfmap'
+
+# Terrain in MovingAI .map files: '.' and 'G' are ground, 'S' is swamp,
+# which is passable; trees, water and out-of-bounds cells are obstacles
+MOVINGAI_BLOCKED = b'@OTW'
+
+_root = getattr(sys, '_MEIPASS', os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+DEFAULT_INDEX = os.path.normpath(os.path.join(_root, 'maps', 'index.json'))
+
+# Scenario grids a catalog keeps loaded at once
+DEFAULT_MAX_LOADED = 16
+
+
+def _costs_offset(shape):
+    # Keep the uint16 layer 8-byte aligned
+    end = HEADER_SIZE + shape[0] * shape[1]
+    return -(-end // 8) * 8
+
+
+def write_map(path, grid):
+    """Save ``grid``, and its cost layer if it has one, in the binary map format."""
+    flags = FLAG_COSTS if grid.weighted else 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, grid.height, grid.width).ljust(HEADER_SIZE, b'\0'))
+        f.write(grid.array.data)
+        if grid.weighted:
+            f.write(b'\0' * (_costs_offset(grid.array.shape) - f.tell()))
+            f.write(grid.costs.data)
+
+
+def read_header(path):
+    """Return ``(height, width, flags)`` from a binary map file, checking its size."""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        size = os.fstat(f.fileno()).st_size
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        raise ValueError(f"{path} is not a binary map file")
+    _, version, flags, height, width = HEADER.unpack(header)
+    if version != VERSION:
+        raise ValueError(f"{path} uses map format version {version}, expected {VERSION}")
+    shape = (height + 2, width + 2)
+    expected = (_costs_offset(shape) + 2 * shape[0] * shape[1]) if flags & FLAG_COSTS else HEADER_SIZE + shape[0] * shape[1]
+    if size != expected:
+        raise ValueError(f"{path} holds {size} bytes, a {width}x{height} map needs {expected}")
+    return height, width, flags
+
+
+def open_map(path, mode='r'):
+    """Memory-map a binary map file as an OccupancyGrid without copying it.
+
+    ``mode`` is passed to ``np.memmap``: the default ``'r'`` gives a
+    read-only grid, ``'c'`` one whose edits stay in memory and ``'r+'`` one
+    whose edits are written back to the file.
+    """
+    height, width, flags = read_header(path)
+    shape = (height + 2, width + 2)
+    padded = np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER_SIZE, shape=shape)
+    if not (np.all(padded[0] == BLOCKED) and np.all(padded[-1] == BLOCKED)
+            and np.all(padded[:, 0] == BLOCKED) and np.all(padded[:, -1] == BLOCKED)):
+        raise ValueError(f"{path} does not have a blocked border")
+    costs = None
+    if flags & FLAG_COSTS:
+        costs = np.memmap(path, dtype=np.uint16, mode=mode, offset=_costs_offset(shape), shape=shape)
+    return OccupancyGrid(padded, costs)
+
+
+def import_movingai(path, terrain_costs=None):
+    """Read an ASCII map in the MovingAI benchmark ``.map`` format.
+
+    ``terrain_costs`` optionally maps terrain characters to movement costs,
+    e.g. ``{'S': 3}`` to make swamps slow; every other passable cell then
+    costs 1.
+    """
+    with open(path, 'rb') as f:
+        fields = {}
+        for line in f:
+            line = line.strip()
+            if line == b'map':
+                break
+            key, _, value = line.partition(b' ')
+            fields[key.decode()] = value.decode()
+        else:
+            raise ValueError(f"{path} has no 'map' line")
+        rows = f.read().split()
+    try:
+        height, width = int(fields['height']), int(fields['width'])
+    except (KeyError, ValueError):
+        raise ValueError(f"{path} is missing its height or width") from None
+    if len(rows) != height or any(len(row) != width for row in rows):
+        raise ValueError(f"{path} does not hold {height} rows of {width} cells")
+
+    terrain = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(height, width)
+    blocked = np.isin(terrain, np.frombuffer(MOVINGAI_BLOCKED, dtype=np.uint8))
+    costs = None
+    if terrain_costs:
+        costs = np.ones(terrain.shape, dtype=np.uint16)
+        for char, cost in terrain_costs.items():
+            costs[terrain == ord(char)] = cost
+    return OccupancyGrid.from_array(blocked, costs)
+
+
+def read_index(path=DEFAULT_INDEX):
+    """Scenario metadata from a JSON index, without opening any map.
+
+    The index maps scenario names to ``{"map": file, "start": [x, y],
+    "goal": [x, y]}``, with map files relative to the index. Returns the
+    entries in file order with absolute map paths.
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    return {
+        name: {'map': os.path.join(base, entry['map']), 'start': tuple(entry['start']), 'goal': tuple(entry['goal'])}
+        for name, entry in entries.items()
+    }
+
+
+def is_movingai(path):
+    """True if the file starts like a MovingAI ``.map`` file."""
+    with open(path, 'rb') as f:
+        return f.readline().startswith(b'type ')
+
+
+def load_map_file(path):
+    """Open a binary map file, or import a MovingAI ``.map`` file."""
+    if os.path.splitext(path)[1] == EXTENSION:
+        return open_map(path)
+    return import_movingai(path)
+
+
+class ScenarioCatalog(Mapping):
+    """Scenario names mapped to ``{'grid', 'start', 'goal'}``, loaded lazily.
+
+    Nothing is read until the catalog is first used, and listing the names
+    only reads the index. Each map is opened the first time its scenario is
+    looked up, and the ``max_loaded`` most recently used grids are kept.
+    Lookups share one grid, so copy it before editing.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX, max_loaded=DEFAULT_MAX_LOADED):
+        self.index_path = index_path
+        self.max_loaded = max_loaded
+        self._index = None
+        self._loaded = OrderedDict()
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = read_index(self.index_path)
+        return self._index
+
+    def __getitem__(self, name):
+        scenario = self._loaded.get(name)
+        if scenario is not None:
+            self._loaded.move_to_end(name)
+            return scenario
+        entry = self.index[name]
+        scenario = {'grid': load_map_file(entry['map']), 'start': entry['start'], 'goal': entry['goal']}
+        self._loaded[name] = scenario
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+        return scenario
+
+    def __contains__(self, name):
+        # Mapping's default would load the map
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
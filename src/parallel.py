@@ -0,0 +1,69 @@
+import os
+import tempfile
+from multiprocessing import Pool
+
+import numpy as np
+
+import batch
+from grid import OccupancyGrid
+from landmarks import LandmarkTables
+from path_cache import PathCache
+
+# Per-worker state, set once by _init_worker
+_grid = None
+_include_path = True
+_cache = None
+_landmarks = None
+
+
+def _init_worker(path, shape, include_path, cache_size, costs_path=None, landmarks_path=None):
+    global _grid, _include_path, _cache, _landmarks
+    costs = np.memmap(costs_path, dtype=np.uint16, mode='r', shape=shape) if costs_path else None
+    _grid = OccupancyGrid(np.memmap(path, dtype=np.uint8, mode='r', shape=shape), costs)
+    _include_path = include_path
+    _cache = PathCache(cache_size) if cache_size else None
+    _landmarks = LandmarkTables.load(landmarks_path, _grid).heuristic if landmarks_path else None
+
+
+def _solve(query):
+    return batch.solve(_grid, query, _include_path, _cache, _landmarks)
+
+
+def run_batch_parallel(grid, queries, workers=None, ordered=True, chunksize=16, include_path=True, cache_size=0,
+                       landmarks=None):
+    """Solve queries on a process pool, yielding result records as they finish.
+
+    The padded occupancy array is written once to a memory-mapped file that
+    every worker maps read-only, so tasks carry only the query itself. With
+    ``ordered`` results come back in input order, otherwise in completion
+    order. Each worker keeps its own path cache of ``cache_size`` entries.
+    A cost layer, if the grid has one, is shared the same way, and so are
+    ``LandmarkTables``: workers map their saved file, or a temporary copy
+    when they were never saved.
+    """
+    paths = []
+    try:
+        for array in (grid.array, grid.costs):
+            if array is None:
+                paths.append(None)
+                continue
+            fd, path = tempfile.mkstemp(prefix='pathfinder-grid-', suffix='.bin')
+            paths.append(path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(array.tobytes())
+        landmarks_path = None
+        if landmarks is not None:
+            landmarks_path = landmarks.path
+            if landmarks_path is None:
+                fd, landmarks_path = tempfile.mkstemp(prefix='pathfinder-landmarks-', suffix='.npy')
+                paths.append(landmarks_path)
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, landmarks.tables)
+        initargs = (paths[0], grid.array.shape, include_path, cache_size, paths[1], landmarks_path)
+        with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            mapper = pool.imap if ordered else pool.imap_unordered
+            yield from mapper(_solve, queries, chunksize)
+    finally:
+        for path in paths:
+            if path is not None:
+                os.remove(path)
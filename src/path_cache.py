@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+from algorithms import REGISTRY
+from tracing import Tracer, TRACE_OFF
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough cost of one cached (x, y) node: the tuple, its two ints and the slot
+# in the path list or explored set
+NODE_BYTES = 120
+
+
+def _entry_bytes(result):
+    path, explored_nodes, _ = result
+    return (len(path) + len(explored_nodes)) * NODE_BYTES
+
+
+def _is_local(name):
+    info = REGISTRY.get(name)
+    return info is not None and info.local
+
+
+def _touches(explored_nodes, cells):
+    for x, y in cells:
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if (x + dx, y + dy) in explored_nodes:
+                    return True
+    return False
+
+
+class PathCache:
+    """LRU cache of ``(path, explored_nodes, execution_time)`` search results.
+
+    Entries are keyed by the grid fingerprint, start, goal, algorithm name
+    and any extra options, so a result is only ever returned for the exact
+    grid content it was computed on. The cache holds at most
+    ``max_entries`` results and roughly ``max_bytes`` of nodes, evicting the
+    least recently used first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(grid, start, goal, algorithm, options=None):
+        return (grid.fingerprint(), tuple(start), tuple(goal), algorithm,
+                tuple(sorted(options.items())) if options else ())
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, result):
+        size = _entry_bytes(result)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def solve(self, algorithm, start, goal, grid, trace=TRACE_OFF, sink=None, **options):
+        """Run the named algorithm through the cache.
+
+        Tracing is not part of the key; a cached answer only emits the
+        summary event, since there is no search to follow.
+        """
+        key = self.key(grid, start, goal, algorithm, options)
+        result = self.get(key)
+        if result is not None:
+            Tracer(algorithm, trace, sink).summary(*result)
+            return result
+        result = REGISTRY[algorithm].function(start, goal, grid, trace=trace, sink=sink, **options)
+        self.put(key, result)
+        return result
+
+    def apply_edits(self, old_fingerprint, new_fingerprint, cells):
+        """Move entries over to an edited grid, dropping the affected ones.
+
+        ``cells`` are the ``(x, y)`` or ``(x, y, value)`` cells that changed
+        between the two fingerprints. A result is kept under the new
+        fingerprint when its search is local (see ``AlgorithmInfo``), its
+        start and goal were not edited and it explored nothing next to an
+        edited cell; every other entry for the old grid is dropped. Returns
+        the number of entries kept.
+        """
+        cells = [(change[0], change[1]) for change in cells]
+        kept = 0
+        for key in [key for key in self._entries if key[0] == old_fingerprint]:
+            result, size = self._entries.pop(key)
+            self.bytes -= size
+            endpoints_edited = key[1] in cells or key[2] in cells
+            if _is_local(key[3]) and not endpoints_edited and not _touches(result[1], cells):
+                self._entries[(new_fingerprint,) + key[1:]] = (result, size)
+                self.bytes += size
+                kept += 1
+        return kept
+
+    def invalidate(self, fingerprint):
+        """Drop every entry computed on the grid with ``fingerprint``."""
+        for key in [key for key in self._entries if key[0] == fingerprint]:
+            self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
@@ -0,0 +1,68 @@
+import heapq
+import itertools
+
+
+class OpenList:
+    """Binary-heap open list with lazy deletion.
+
+    Pushing a node that is already queued replaces its priority; the old heap
+    entry stays behind and is skipped when it surfaces. Ties on priority are
+    broken by insertion order, so the search order is fully deterministic.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def push(self, node, priority):
+        count = next(self._counter)
+        self._entries[node] = (priority, count)
+        heapq.heappush(self._heap, (priority, count, node))
+
+    def pop(self):
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            priority, count, node = heapq.heappop(heap)
+            entry = entries.get(node)
+            if entry is not None and entry[1] == count:
+                del entries[node]
+                return node
+        raise KeyError('pop from an empty open list')
+
+    def remove(self, node):
+        del self._entries[node]
+
+    def priority(self, node):
+        return self._entries[node][0]
+
+    def peek(self):
+        """Return ``(priority, node)`` for the next node without removing it."""
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            priority, count, node = heap[0]
+            entry = entries.get(node)
+            if entry is not None and entry[1] == count:
+                return priority, node
+            heapq.heappop(heap)
+        raise KeyError('peek at an empty open list')
+
+    def peek_priority(self):
+        return self.peek()[0]
+
+    def __contains__(self, node):
+        return node in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __repr__(self):
+        return f"OpenList({set(self._entries)})"
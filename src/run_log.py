@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+LOG_DIR = 'Console Logs'
+RUN_LOG_DIR = os.path.join(LOG_DIR, 'runs')
+RUN_LOG_SUFFIX = '.jsonl.gz'
+# Run logs kept in RUN_LOG_DIR; the oldest are deleted when a run starts
+MAX_RUN_LOGS = 20
+# Trace logs get large and are written while the search runs, so favour speed
+COMPRESS_LEVEL = 1
+
+
+def log_name(*parts):
+    """File-name-safe join of names such as the scenario and algorithm."""
+    return '_'.join(re.sub(r'[<>:"/\\|?*\s]', '_', part) for part in parts)
+
+
+def event_record(event):
+    return {key: value for key, value in event._asdict().items() if value is not None}
+
+
+def rotate(directory, keep):
+    """Delete all but the ``keep`` most recent run logs in ``directory``."""
+    logs = sorted((entry for entry in os.scandir(directory) if entry.name.endswith(RUN_LOG_SUFFIX)),
+                  key=lambda entry: entry.stat().st_mtime)
+    for entry in logs[:max(len(logs) - keep, 0)]:
+        os.remove(entry.path)
+
+
+def read_run_log(path):
+    """Yield the records of a run log, header first."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+class RunLog:
+    """Trace sink that streams events to a gzip-compressed JSON lines file.
+
+    The first record describes the run and every later one is a trace
+    event as a dict, with ``None`` fields left out. Writes take a lock, so
+    the UI thread can ``flush``, ``copy_to`` or ``close`` the log while a
+    search thread is still writing to it; events after ``close`` are
+    dropped.
+    """
+
+    def __init__(self, path, header=None):
+        self.path = path
+        self.events = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=COMPRESS_LEVEL)
+        if header is not None:
+            self.record(header)
+
+    @classmethod
+    def start(cls, scenario, algorithm, directory=RUN_LOG_DIR, keep=MAX_RUN_LOGS, **details):
+        """Open a log for one run, named after its scenario, algorithm and start time."""
+        os.makedirs(directory, exist_ok=True)
+        rotate(directory, keep - 1)
+        now = time.time()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        name = log_name(scenario, algorithm, stamp)
+        path = os.path.join(directory, name + RUN_LOG_SUFFIX)
+        number = 1
+        while os.path.exists(path):
+            number += 1
+            path = os.path.join(directory, f"{name}-{number}{RUN_LOG_SUFFIX}")
+        header = {'kind': 'run', 'scenario': scenario, 'algorithm': algorithm,
+                  'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))}
+        header.update(details)
+        return cls(path, header)
+
+    @property
+    def closed(self):
+        return self._gzip is None
+
+    def record(self, record):
+        line = (json.dumps(record) + "\n").encode()
+        with self._lock:
+            if self._gzip is not None:
+                self._gzip.write(line)
+
+    def __call__(self, event):
+        line = (json.dumps(event_record(event)) + "\n").encode()
+        with self._lock:
+            if self._gzip is not None:
+                self._gzip.write(line)
+                self.events += 1
+
+    def _end_member(self):
+        # Ending the gzip member leaves a complete file on disk; the next
+        # writes go into a new member, which gzip readers simply continue with
+        self._gzip.close()
+        self._file.flush()
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=COMPRESS_LEVEL)
+
+    def flush(self):
+        with self._lock:
+            if self._gzip is not None:
+                self._end_member()
+
+    def copy_to(self, path):
+        """Copy the log as written so far, e.g. to keep it past rotation."""
+        with self._lock:
+            if self._gzip is not None:
+                self._end_member()
+            shutil.copyfile(self.path, path)
+
+    def close(self):
+        with self._lock:
+            if self._gzip is not None:
+                self._gzip.close()
+                self._file.close()
+                self._gzip = None
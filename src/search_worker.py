@@ -0,0 +1,78 @@
+import sys
+import threading
+
+from tracing import EXPAND, PrintSink
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search by the sink of a cancelled SearchWorker."""
+
+
+class SearchWorker:
+    """Runs a search on a background thread so the UI stays responsive.
+
+    ``solve`` is called on the thread with this worker as its trace sink
+    and should run the search at ``TRACE_FULL`` with it. The worker forwards
+    every event to ``sink`` (printing them by default), keeps the expanded
+    nodes for ``take_explored``, and raises ``SearchCancelled`` from the
+    next event once ``cancel`` has been called, so a search stops after at
+    most one more expansion. Work a search does before its first event,
+    such as building HPA* or JPS+ tables, is not interrupted.
+
+    When ``done`` is set, ``result`` holds the return value of ``solve``,
+    or ``error`` the ``sys.exc_info()`` of whatever it raised. Callers that
+    are about to change the grid or caches the search reads should ``join``
+    it after ``cancel``.
+    """
+
+    def __init__(self, solve, sink=None):
+        self.solve = solve
+        self.sink = sink if sink is not None else PrintSink()
+        self.result = None
+        self.error = None
+        self.expanded = 0
+        self.done = threading.Event()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._explored = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def join(self, timeout=None):
+        """Wait for the search to end; returns False if ``timeout`` ran out first."""
+        return self.done.wait(timeout)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def __call__(self, event):
+        if self._cancelled.is_set():
+            raise SearchCancelled()
+        if event.kind == EXPAND:
+            with self._lock:
+                self._explored.append(event.node)
+                self.expanded += 1
+        self.sink(event)
+
+    def take_explored(self):
+        """Nodes expanded since the last call, in expansion order."""
+        with self._lock:
+            nodes, self._explored = self._explored, []
+        return nodes
+
+    def _run(self):
+        try:
+            self.result = self.solve(self)
+        except SearchCancelled:
+            pass
+        except Exception:
+            self.error = sys.exc_info()
+        finally:
+            self.done.set()
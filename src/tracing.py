@@ -0,0 +1,99 @@
+import sys
+from collections import namedtuple
+
+TRACE_OFF = 'off'
+TRACE_SUMMARY = 'summary'
+TRACE_FULL = 'full'
+TRACE_LEVELS = (TRACE_OFF, TRACE_SUMMARY, TRACE_FULL)
+
+# Event kinds emitted at TRACE_FULL
+EXPAND = 'expand'  # node taken off the frontier
+PUSH = 'push'      # node added to the frontier for the first time
+RELAX = 'relax'    # frontier node reached again through a cheaper parent
+JUMP = 'jump'      # jump point found by Jump Point Search
+
+TraceEvent = namedtuple('TraceEvent', ['kind', 'node', 'parent', 'g', 'f'], defaults=(None, None, None))
+SummaryEvent = namedtuple('SummaryEvent', ['kind', 'algorithm', 'path', 'nodes_explored', 'execution_time'])
+
+
+class PrintSink:
+    """Renders trace events as readable text.
+
+    The stream is looked up on every call unless one is given, so output
+    follows whatever ``sys.stdout`` points at when the search runs.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(format_event(event) + "\n")
+
+
+class TeeSink:
+    """Forwards every event to each of several sinks, in order."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def __call__(self, event):
+        for sink in self.sinks:
+            sink(event)
+
+
+def format_event(event):
+    if event.kind == 'summary':
+        lines = ["-" * 40]
+        if event.path:
+            lines.append(f"{event.algorithm}: goal reached")
+            lines.append(f"Final path: {event.path}")
+        else:
+            lines.append(f"{event.algorithm}: no path found")
+        lines.append(f"Nodes explored: {event.nodes_explored}")
+        lines.append(f"Execution time: {event.execution_time:.10f} seconds")
+        lines.append("-" * 40)
+        return "\n".join(lines)
+
+    if event.kind == EXPAND:
+        text = f"Current node: {event.node}"
+    elif event.kind == PUSH:
+        text = f"  Added to open set: {event.node} from {event.parent}"
+    elif event.kind == RELAX:
+        text = f"  Cheaper path to {event.node} via {event.parent}"
+    elif event.kind == JUMP:
+        text = f"  Jump point: {event.node} from {event.parent}"
+    else:
+        text = f"{event.kind}: {event.node}"
+    scores = []
+    if event.g is not None:
+        scores.append(f"g={event.g}")
+    if event.f is not None:
+        scores.append(f"f={event.f}")
+    if scores:
+        text += " (" + ", ".join(scores) + ")"
+    return text
+
+
+class Tracer:
+    """Forwards search events to a sink according to the trace level.
+
+    Searches check ``tracer.full`` before building an event, so with tracing
+    off the hot loops pay only for a local boolean test.
+    """
+
+    def __init__(self, algorithm, level=TRACE_OFF, sink=None):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level {level!r}, expected one of {TRACE_LEVELS}")
+        self.algorithm = algorithm
+        self.level = level
+        self.full = level == TRACE_FULL
+        self.enabled = level != TRACE_OFF
+        self.sink = sink if sink is not None else PrintSink()
+
+    def emit(self, kind, node, parent=None, g=None, f=None):
+        self.sink(TraceEvent(kind, node, parent, g, f))
+
+    def summary(self, path, nodes_explored, execution_time):
+        if self.enabled:
+            self.sink(SummaryEvent('summary', self.algorithm, path, len(nodes_explored), execution_time))
@@ -1,28 +1,75 @@
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+
 from kivy.clock import Clock
-import numpy as np
 
+# Console widget refreshes per second, and lines it keeps on screen
+CONSOLE_REFRESH_RATE = 10
+CONSOLE_MAX_LINES = 1000
 
-def get_grid_state(grid_layout):
-    grid_size_x = grid_layout.cols
-    grid_size_y = grid_layout.rows
-    grid_state = [[0 for _ in range(grid_size_x)] for _ in range(grid_size_y)]
-    for cell in grid_layout.children:
-        x, y = cell.position
-        grid_state[y][x] = 1 if cell.cell_state == 'obstacle' else 0
-    return grid_state
 
+class TextOutput:
+    """File-like console for a TextInput, safe to write to from any thread.
 
+    Writes land in a ring buffer holding the last ``max_lines`` lines, and
+    the widget is refreshed from it by a Clock trigger at most ``rate``
+    times per second, so a flood of trace output costs one redraw per
+    tick rather than one per write. Unless ``spill`` is False every write
+    also goes to a temporary file, which keeps the full log for ``save``.
+    """
 
-class TextOutput:
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, max_lines=CONSOLE_MAX_LINES, rate=CONSOLE_REFRESH_RATE, spill=True):
         self.text_widget = text_widget
+        self.lines = deque(maxlen=max_lines)
+        self.partial = ''
+        self._lock = threading.Lock()
+        self._spill = tempfile.TemporaryFile('w+', encoding='utf-8') if spill else None
+        self._refresh = Clock.create_trigger(self._update_widget, 1 / rate)
 
     def write(self, text):
-        def append_text(*args):
-            self.text_widget.text += text
-            self.text_widget.cursor = (0, len(self.text_widget.text)) 
-
-        Clock.schedule_once(append_text)
+        with self._lock:
+            lines = (self.partial + text).split('\n')
+            self.partial = lines.pop()
+            self.lines.extend(lines)
+            if self._spill is not None:
+                self._spill.write(text)
+        self._refresh()
+        return len(text)
 
     def flush(self):
-        pass
+        with self._lock:
+            if self._spill is not None:
+                self._spill.flush()
+
+    def text(self):
+        """The text on screen: the last ``max_lines`` lines written."""
+        with self._lock:
+            return '\n'.join(self.lines) + ('\n' if self.lines else '') + self.partial
+
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self.partial = ''
+            if self._spill is not None:
+                self._spill.seek(0)
+                self._spill.truncate()
+        self._refresh()
+
+    def save(self, path):
+        """Write the full log, or just the buffered lines without a spill file."""
+        with self._lock, open(path, 'w', encoding='utf-8') as f:
+            if self._spill is None:
+                f.write('\n'.join(self.lines) + ('\n' if self.lines else '') + self.partial)
+                return
+            self._spill.flush()
+            self._spill.seek(0)
+            shutil.copyfileobj(self._spill, f)
+            self._spill.seek(0, os.SEEK_END)
+
+    def _update_widget(self, *args):
+        text = self.text()
+        self.text_widget.text = text
+        self.text_widget.cursor = (0, text.count('\n'))
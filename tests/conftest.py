@@ -0,0 +1,5 @@
+import os
+import sys
+
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, src_dir)
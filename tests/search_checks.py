@@ -0,0 +1,69 @@
+import math
+import random
+
+from algorithms import bfs, dijkstra, path_cost
+from grid import OccupancyGrid
+
+
+def free_cells(grid):
+    return [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_free((x, y))]
+
+
+def random_queries(grid, count, seed):
+    """``count`` seeded ``(start, goal)`` pairs of free cells."""
+    rng = random.Random(seed)
+    free = free_cells(grid)
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def reference_path(start, goal, grid, diagonal=True):
+    """Dijkstra's path on a copy of ``grid``, untouched by any cached search state.
+
+    Four-connected searches are measured against BFS instead, which counts steps.
+    """
+    copy = OccupancyGrid.from_array(grid.to_array(), grid.to_costs())
+    return (dijkstra if diagonal else bfs)(start, goal, copy)[0]
+
+
+def assert_valid_path(path, start, goal, grid, diagonal=True):
+    """``path`` runs from ``start`` to ``goal`` over free cells in single steps."""
+    assert path[0] == start and path[-1] == goal
+    assert all(grid.is_free(node) for node in path)
+    for a, b in zip(path, path[1:]):
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        assert max(dx, dy) == 1 and (diagonal or dx + dy == 1)
+
+
+def assert_valid_segments(path, start, goal, grid, diagonal=True):
+    """Every segment is a straight or diagonal run over free cells.
+
+    Jump point searches return only the turning points, so a segment may
+    be longer than one step.
+    """
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        dx, dy = x1 - x0, y1 - y0
+        assert (dx, dy) != (0, 0)
+        assert dx == 0 or dy == 0 or (diagonal and abs(dx) == abs(dy))
+        steps = max(abs(dx), abs(dy))
+        sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+        assert all(grid.is_free((x0 + i * sx, y0 + i * sy)) for i in range(steps + 1))
+
+
+def assert_matches_dijkstra(path, start, goal, grid):
+    expected = reference_path(start, goal, grid)
+    assert bool(path) == bool(expected)
+    if path:
+        assert_valid_path(path, start, goal, grid)
+        assert math.isclose(path_cost(path, grid), path_cost(expected, grid))
+
+
+def assert_optimal(search, grid, queries, diagonal=True):
+    """``search`` finds a path exactly when the reference does, at the same cost."""
+    for start, goal in queries:
+        path = search(start, goal, grid)[0]
+        expected = reference_path(start, goal, grid, diagonal)
+        assert bool(path) == bool(expected)
+        if path:
+            assert_valid_segments(path, start, goal, grid, diagonal)
+            assert math.isclose(path_cost(path, grid), path_cost(expected, grid))
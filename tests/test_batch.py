@@ -0,0 +1,38 @@
+import batch
+from grid import OccupancyGrid
+
+
+def run(lines):
+    grid = OccupancyGrid.empty(10, 10)
+    return list(batch.run_batch(grid, batch.read_queries(lines, 'A*'), include_path=False))
+
+
+def test_bad_query_lines_become_error_records():
+    results = run([
+        '{"start": [0, 0], "goal": [9, 9]}',
+        '{"start": [0, 0], "goal": [9, 9]',
+        '{"id": "no-goal", "start": [0, 0]}',
+        '{"start": [0, 0, 0], "goal": [9, 9]}',
+        '{"start": [0, 0], "goal": "9,9"}',
+        '{"start": [0, 0], "goal": [9, 9], "algorithm": ["A*"]}',
+        '[0, 0]',
+        '{"start": [0, 0], "goal": [20, 20]}',
+        '{"start": [0, 0], "goal": [9, 0]}',
+    ])
+    assert [result['id'] for result in results] == [0, 1, 'no-goal', 3, 4, 5, 6, 7, 8]
+    assert results[0]['found'] and results[-1]['found']
+    assert all('error' in result for result in results[1:-1])
+    assert "'goal'" in results[2]['error']
+
+
+def test_unknown_algorithm_is_reported_per_query():
+    results = run(['{"start": [0, 0], "goal": [9, 9], "algorithm": "Nope"}'])
+    assert results[0]['error'] == "Unknown algorithm 'Nope'"
+
+
+def test_blocked_start_is_not_found_by_any_algorithm():
+    grid = OccupancyGrid.empty(3, 3)
+    grid.set_cell((0, 0), True)
+    queries = [{'id': name, 'start': (0, 0), 'goal': (2, 2), 'algorithm': name} for name in batch.REGISTRY]
+    results = list(batch.run_batch(grid, queries, include_path=False))
+    assert all(result['found'] is False and result['cost'] is None for result in results)
@@ -0,0 +1,25 @@
+import pytest
+
+import benchmark
+import hpa
+from algorithms import hierarchical_pathfinding
+from grid import OccupancyGrid
+from grid_generators import corner_endpoints, random_obstacles
+
+
+def test_measure_builds_caches_in_its_first_run():
+    array = random_obstacles(40, 40, seed=5)
+    grid = OccupancyGrid.from_array(array)
+    start, goal = corner_endpoints(array)
+    warm = hpa.get_abstract_graph(grid)
+    record = benchmark.measure(hierarchical_pathfinding, start, goal, grid, repeat=2, memory=False)
+    # The graph built before measuring was dropped and built again
+    assert hpa.get_abstract_graph(grid) is not warm
+    assert record['build_time'] > 0 and record['wall_time'] > 0
+    assert record['found']
+
+
+def test_measure_needs_a_timed_run():
+    grid = OccupancyGrid.empty(5, 5)
+    with pytest.raises(ValueError):
+        benchmark.measure(hierarchical_pathfinding, (0, 0), (4, 4), grid, repeat=0)
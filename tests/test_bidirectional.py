@@ -0,0 +1,23 @@
+import pytest
+
+from algorithms import bidirectional_astar, bidirectional_bfs, bidirectional_dijkstra
+from grid import OccupancyGrid
+from grid_generators import GRID_KINDS, generate, terrain_costs
+from search_checks import assert_optimal, random_queries
+
+SIZE = 40
+
+
+@pytest.mark.parametrize('kind', GRID_KINDS)
+@pytest.mark.parametrize('search', [bidirectional_astar, bidirectional_dijkstra])
+@pytest.mark.parametrize('weighted', [False, True])
+def test_bidirectional_best_first_matches_dijkstra(search, kind, weighted):
+    costs = terrain_costs(SIZE, SIZE, seed=2) if weighted else None
+    grid = OccupancyGrid.from_array(generate(kind, SIZE, SIZE, seed=2), costs)
+    assert_optimal(search, grid, random_queries(grid, 15, seed=2))
+
+
+@pytest.mark.parametrize('kind', GRID_KINDS)
+def test_bidirectional_bfs_matches_bfs(kind):
+    grid = OccupancyGrid.from_array(generate(kind, SIZE, SIZE, seed=2))
+    assert_optimal(bidirectional_bfs, grid, random_queries(grid, 15, seed=2), diagonal=False)
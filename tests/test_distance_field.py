@@ -0,0 +1,16 @@
+import pytest
+
+from algorithms import flow_field
+from grid import OccupancyGrid
+from grid_generators import GRID_KINDS, generate, terrain_costs
+from search_checks import assert_optimal, random_queries
+
+SIZE = 40
+
+
+@pytest.mark.parametrize('kind', GRID_KINDS)
+@pytest.mark.parametrize('weighted', [False, True])
+def test_flow_field_paths_match_dijkstra(kind, weighted):
+    costs = terrain_costs(SIZE, SIZE, seed=3) if weighted else None
+    grid = OccupancyGrid.from_array(generate(kind, SIZE, SIZE, seed=3), costs)
+    assert_optimal(flow_field, grid, random_queries(grid, 15, seed=3))
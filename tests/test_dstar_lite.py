@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from dstar_lite import DStarLite
+from grid import OccupancyGrid
+from grid_generators import random_obstacles, terrain_costs
+from search_checks import assert_matches_dijkstra, free_cells
+
+SIZE = 24
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('weighted', [False, True])
+def test_move_start_matches_dijkstra(seed, weighted):
+    rng = random.Random(seed)
+    costs = terrain_costs(SIZE, SIZE, patch=4, seed=seed) if weighted else None
+    grid = OccupancyGrid.from_array(random_obstacles(SIZE, SIZE, 0.25, seed), costs)
+    cells = free_cells(grid)
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    planner = DStarLite(grid, start, goal)
+    assert_matches_dijkstra(planner.replan(), start, goal, grid)
+    for _ in range(25):
+        start = rng.choice(cells)
+        planner.move_start(start)
+        assert_matches_dijkstra(planner.replan(), start, goal, grid)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_moves_and_edits_match_dijkstra(seed):
+    rng = random.Random(seed)
+    grid = OccupancyGrid.from_array(random_obstacles(SIZE, SIZE, 0.2, seed))
+    start, goal = (0, 0), (SIZE - 1, SIZE - 1)
+    planner = DStarLite(grid, start, goal)
+    planner.replan()
+    for _ in range(25):
+        start = rng.choice(free_cells(grid))
+        planner.move_start(start)
+        changes = []
+        for _ in range(rng.randint(1, 10)):
+            node = (rng.randrange(SIZE), rng.randrange(SIZE))
+            if node not in (start, goal):
+                changes.append((node[0], node[1], rng.random() < 0.6))
+        planner.update_cells(changes)
+        assert_matches_dijkstra(planner.replan(), start, goal, grid)
@@ -0,0 +1,22 @@
+from grid import GridCache, OccupancyGrid
+
+
+def test_grid_cache_keys_by_content_and_evicts_the_oldest():
+    cache = GridCache(2)
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or name
+
+    grid = OccupancyGrid.empty(4, 4)
+    assert cache.get(grid, build('a'), 1) == 'a'
+    assert cache.get(grid.copy(), build('again'), 1) == 'a'
+    assert cache.get(grid, build('b'), 2) == 'b'
+    grid.set_cell((1, 1), True)
+    assert cache.get(grid, build('c'), 1) == 'c'
+    assert len(cache) == 2 and builds == ['a', 'b', 'c']
+    grid.set_cell((1, 1), False)
+    # 'a' was the least recently used entry, so it was evicted
+    assert cache.get(grid, build('a2'), 1) == 'a2'
+    cache.clear()
+    assert len(cache) == 0
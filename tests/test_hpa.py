@@ -0,0 +1,31 @@
+import pytest
+
+from algorithms import hierarchical_pathfinding, path_cost
+from grid import OccupancyGrid
+from grid_generators import generate, random_obstacles, terrain_costs
+from search_checks import assert_valid_path, random_queries, reference_path
+
+SIZE = 48
+
+
+@pytest.mark.parametrize('kind', ['random', 'maze', 'rooms', 'open'])
+@pytest.mark.parametrize('weighted', [False, True])
+def test_paths_are_valid_and_no_shorter_than_dijkstra(kind, weighted):
+    costs = terrain_costs(SIZE, SIZE, seed=1) if weighted else None
+    grid = OccupancyGrid.from_array(generate(kind, SIZE, SIZE, seed=1), costs)
+    for start, goal in random_queries(grid, 20, seed=1):
+        path = hierarchical_pathfinding(start, goal, grid)[0]
+        expected = reference_path(start, goal, grid)
+        assert bool(path) == bool(expected)
+        if path:
+            assert_valid_path(path, start, goal, grid)
+            assert path_cost(path, grid) >= path_cost(expected, grid) - 1e-9
+
+
+def test_blocked_endpoints_have_no_path():
+    grid = OccupancyGrid.from_array(random_obstacles(SIZE, SIZE, seed=1))
+    blocked = (SIZE - 2, SIZE - 3)
+    grid.set_cell(blocked, True)
+    assert hierarchical_pathfinding((0, 0), blocked, grid)[0] == []
+    assert hierarchical_pathfinding(blocked, (0, 0), grid)[0] == []
+    assert hierarchical_pathfinding(blocked, blocked, grid)[0] == []
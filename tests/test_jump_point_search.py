@@ -0,0 +1,22 @@
+import pytest
+
+from algorithms import jump_point_search, jump_point_search_plus
+from grid import OccupancyGrid
+from grid_generators import GRID_KINDS, generate
+from search_checks import assert_optimal, random_queries
+
+SIZE = 40
+
+
+@pytest.mark.parametrize('kind', GRID_KINDS)
+@pytest.mark.parametrize('search', [jump_point_search, jump_point_search_plus])
+def test_jump_point_paths_match_dijkstra(search, kind):
+    grid = OccupancyGrid.from_array(generate(kind, SIZE, SIZE, seed=2))
+    assert_optimal(search, grid, random_queries(grid, 15, seed=2))
+
+
+@pytest.mark.parametrize('search', [jump_point_search, jump_point_search_plus])
+def test_cost_layers_are_rejected(search):
+    grid = OccupancyGrid.from_array(generate('open', SIZE, SIZE), generate('open', SIZE, SIZE) + 1)
+    with pytest.raises(ValueError):
+        search((0, 0), (SIZE - 1, SIZE - 1), grid)
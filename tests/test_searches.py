@@ -0,0 +1,24 @@
+import pytest
+
+from algorithms import REGISTRY
+from grid import OccupancyGrid
+from grid_generators import generate
+
+SIZE = 40
+
+
+@pytest.mark.parametrize('info', REGISTRY.values(), ids=lambda info: info.name)
+def test_blocked_goal_has_no_path(info):
+    grid = OccupancyGrid.from_array(generate('open', SIZE, SIZE, seed=4))
+    goal = (SIZE // 2, SIZE // 2)
+    grid.set_cell(goal, True)
+    assert info.function((0, 0), goal, grid)[0] == []
+
+
+@pytest.mark.parametrize('info', REGISTRY.values(), ids=lambda info: info.name)
+def test_blocked_start_has_no_path(info):
+    grid = OccupancyGrid.from_array(generate('open', SIZE, SIZE, seed=4))
+    start = (SIZE // 2, SIZE // 2)
+    grid.set_cell(start, True)
+    assert info.function(start, (0, 0), grid)[0] == []
+    assert info.function(start, start, grid)[0] == []
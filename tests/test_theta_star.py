@@ -0,0 +1,31 @@
+import math
+
+import pytest
+
+from algorithms import line_of_sight, path_cost, theta_star
+from grid import OccupancyGrid
+from grid_generators import corner_endpoints, generate
+from search_checks import reference_path
+
+SIZE = 48
+
+
+def test_open_grid_path_is_one_straight_segment():
+    path = theta_star((0, 0), (19, 5), OccupancyGrid.empty(20, 20))[0]
+    assert path == [(0, 0), (19, 5)]
+    assert math.isclose(path_cost(path), math.hypot(19, 5))
+
+
+@pytest.mark.parametrize('kind', ['random', 'rooms', 'open'])
+@pytest.mark.parametrize('seed', range(4))
+def test_waypoints_see_each_other_and_beat_grid_paths(kind, seed):
+    array = generate(kind, SIZE, SIZE, seed=seed)
+    grid = OccupancyGrid.from_array(array)
+    start, goal = corner_endpoints(array)
+    path = theta_star(start, goal, grid)[0]
+    expected = reference_path(start, goal, grid)
+    assert bool(path) == bool(expected)
+    if path:
+        assert path[0] == start and path[-1] == goal
+        assert all(line_of_sight(grid, a, b) for a, b in zip(path, path[1:]))
+        assert path_cost(path) <= path_cost(expected) + 1e-9